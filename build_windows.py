@@ -22,13 +22,16 @@ def check_models():
     print("-" * 40)
     
     # 仅供参考，显示本地是否有模型
-    local_model_dir = Path("easyocr_models")
-    if local_model_dir.exists():
-        models = list(local_model_dir.glob("*.pth"))
-        if models:
-            print(f"\n参考：本地有 {len(models)} 个模型文件（不会打包）")
-            total_size = sum(m.stat().st_size for m in models) / (1024*1024)
-            print(f"总大小: {total_size:.1f} MB")
+    try:
+        # 单次scandir同时取得文件列表和大小，目录不存在时直接跳过
+        with os.scandir("easyocr_models") as it:
+            sizes = [e.stat().st_size for e in it if e.name.endswith('.pth')]
+    except (FileNotFoundError, NotADirectoryError):
+        sizes = []
+    if sizes:
+        print(f"\n参考：本地有 {len(sizes)} 个模型文件（不会打包）")
+        total_size = sum(sizes) / (1024*1024)
+        print(f"总大小: {total_size:.1f} MB")
     
     print("\n✅ 配置检查通过（模型由用户提供）")
     return True
@@ -4,10 +4,12 @@
 提供OCR结果缓存，减少重复处理
 """
 
+import os
+import heapq
 import hashlib
 import json
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from pathlib import Path
 import pickle
 from logger_config import get_logger
@@ -133,21 +135,28 @@ class CacheManager:
     
     def _check_disk_size(self):
         """检查磁盘缓存大小"""
-        total_size = sum(
-            f.stat().st_size for f in self.cache_dir.glob("*.cache")
-        )
+        # 单次scandir同时取得大小和修改时间，不再重复glob和stat
+        cache_files = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".cache"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                total_size += st.st_size
+                cache_files.append((st.st_mtime, entry.path, entry.name))
         
         if total_size > self.max_size_mb * 1024 * 1024:
-            # 删除最旧的文件
-            cache_files = sorted(
-                self.cache_dir.glob("*.cache"),
-                key=lambda f: f.stat().st_mtime
-            )
-            
-            # 删除最旧的文件，直到大小合适
-            for cache_file in cache_files[:len(cache_files)//3]:
-                cache_file.unlink()
-                logger.info(f"Deleted old cache: {cache_file.name}")
+            # 删除最旧的1/3文件，只需选出这部分而不必整体排序
+            for _, path, name in heapq.nsmallest(len(cache_files) // 3, cache_files):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                logger.info(f"Deleted old cache: {name}")
     
     def cleanup_expired(self):
         """清理过期缓存"""
@@ -207,24 +216,24 @@ class OCRCache:
     def __init__(self, ttl: int = 300):
         self.cache_manager = CacheManager(cache_dir=".ocr_cache", ttl=ttl)
     
-    def get_ocr_result(self, image_hash: str, region: Optional[Dict] = None) -> Optional[Dict]:
-        """获取OCR结果缓存"""
-        # 生成包含区域信息的键
+    @staticmethod
+    def _make_key(image_hash: Union[str, bytes], region: Optional[Dict] = None) -> str:
+        """生成包含区域信息的缓存键，摘要字节转为十六进制以便用作文件名"""
+        if isinstance(image_hash, bytes):
+            image_hash = image_hash.hex()
         cache_key = f"ocr_{image_hash}"
         if region:
             region_str = f"{region.get('x', 0)}_{region.get('y', 0)}_{region.get('width', 0)}_{region.get('height', 0)}"
             cache_key = f"{cache_key}_{region_str}"
-        
-        return self.cache_manager.get(cache_key)
+        return cache_key
+    
+    def get_ocr_result(self, image_hash: Union[str, bytes], region: Optional[Dict] = None) -> Optional[Dict]:
+        """获取OCR结果缓存"""
+        return self.cache_manager.get(self._make_key(image_hash, region))
     
-    def set_ocr_result(self, image_hash: str, result: Dict, region: Optional[Dict] = None):
+    def set_ocr_result(self, image_hash: Union[str, bytes], result: Dict, region: Optional[Dict] = None):
         """设置OCR结果缓存"""
-        cache_key = f"ocr_{image_hash}"
-        if region:
-            region_str = f"{region.get('x', 0)}_{region.get('y', 0)}_{region.get('width', 0)}_{region.get('height', 0)}"
-            cache_key = f"{cache_key}_{region_str}"
-        
-        self.cache_manager.set(cache_key, result)
+        self.cache_manager.set(self._make_key(image_hash, region), result)
     
     def clear(self):
         """清空OCR缓存"""
@@ -140,7 +140,7 @@ class ConfigManager:
                 "use_gpu": False,
                 "easyocr": {
                     "use_gpu": False,
-                    "verbose": True,
+                    "verbose": False,
                     "model_storage_directory": "./easyocr_models"
                 }
             },
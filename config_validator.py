@@ -34,12 +34,18 @@ class ConfigValidator:
             },
             'language': {'type': str, 'default': 'ch', 'options': ['ch', 'en', 'ch_sim']},
             'use_angle_cls': {'type': bool, 'default': False},
-            'use_absolute_value': {'type': bool, 'default': False}  # 是否取绝对值
+            'use_absolute_value': {'type': bool, 'default': False},  # 是否取绝对值
+            'preprocess': {'type': str, 'default': 'none', 'options': ['none', 'threshold']},  # 识别前的图像预处理
+            'debug_dump_preprocessed': {'type': bool, 'default': False},  # 是否保存预处理后的调试图像
+            'blank_std_threshold': {'type': float, 'default': 3.0, 'min': 0}  # 低于该标准差的空白图像跳过识别，0为关闭
         },
         'storage': {
             'screenshot_dir': {'type': str, 'default': './screenshots'},
             'auto_cleanup_days': {'type': int, 'default': 30, 'min': 1, 'max': 365},
-            'max_storage_mb': {'type': int, 'default': 1000, 'min': 100}
+            'max_storage_mb': {'type': int, 'default': 1000, 'min': 100},
+            'image_format': {'type': str, 'default': 'jpg', 'options': ['jpg', 'png', 'webp']},  # 截图保存格式，webp为无损
+            'jpeg_quality': {'type': int, 'default': 95, 'min': 1, 'max': 100},  # jpg格式的编码质量
+            'async_save': {'type': bool, 'default': False}  # 后台线程写盘，返回路径时文件可能尚未写完
         },
         'http': {
             'host': {'type': str, 'default': '0.0.0.0'},
@@ -52,7 +58,11 @@ class ConfigValidator:
             'max_image_size': {'type': int, 'default': 1920, 'min': 480},
             'ocr_timeout': {'type': int, 'default': 30, 'min': 5},
             'enable_cache': {'type': bool, 'default': True},
-            'cache_ttl': {'type': int, 'default': 300, 'min': 60}
+            'cache_ttl': {'type': int, 'default': 300, 'min': 60},
+            'denoise_mode': {'type': str, 'default': 'gaussian', 'options': ['none', 'gaussian', 'bilateral']},
+            'memory_monitor_sample_rate': {'type': int, 'default': 32, 'min': 1},
+            'contrast_threshold': {'type': float, 'default': 50.0, 'min': 0},  # 灰度标准差高于此值时跳过CLAHE
+            'noise_threshold': {'type': float, 'default': 100.0, 'min': 0}  # 拉普拉斯方差低于此值时跳过降噪
         }
     }
     @classmethod
@@ -91,6 +101,18 @@ class ConfigValidator:
                         if 'max' in rules and value > rules['max']:
                             errors.append(f"{section}.{key} must be <= {rules['max']}, got {value}")
                     
+                    elif expected_type == float:
+                        # JSON中的整数写法（如 3）同样是合法的浮点值
+                        if not isinstance(value, (int, float)) or isinstance(value, bool):
+                            errors.append(f"{section}.{key} must be number, got {type(value).__name__}")
+                            continue
+                        
+                        # 范围检查
+                        if 'min' in rules and value < rules['min']:
+                            errors.append(f"{section}.{key} must be >= {rules['min']}, got {value}")
+                        if 'max' in rules and value > rules['max']:
+                            errors.append(f"{section}.{key} must be <= {rules['max']}, got {value}")
+                    
                     elif expected_type == str:
                         if not isinstance(value, str):
                             errors.append(f"{section}.{key} must be string, got {type(value).__name__}")
@@ -196,10 +218,14 @@ class ConfigValidator:
         """验证单个值"""
         if 'type' in rules:
             expected_type = rules['type']
-            if not isinstance(value, expected_type):
+            if expected_type == float:
+                # 整数写法同样是合法的浮点值
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    return False
+            elif not isinstance(value, expected_type):
                 return False
             
-            if expected_type == int:
+            if expected_type in (int, float):
                 if 'min' in rules and value < rules['min']:
                     return False
                 if 'max' in rules and value > rules['max']:
@@ -138,12 +138,20 @@ def test_model_path():
         model_path = ModelPathManager.get_easyocr_model_path()
         print(f"EasyOCR模型路径: {model_path}")
         
-        if model_path and Path(model_path).exists():
-            models = list(Path(model_path).glob("*.pth"))
+        # 直接scandir，目录不存在时由异常判断，文件大小取自DirEntry缓存的stat
+        models = None
+        if model_path:
+            try:
+                with os.scandir(model_path) as it:
+                    models = [(e.name, e.stat().st_size) for e in it if e.name.endswith('.pth')]
+            except (FileNotFoundError, NotADirectoryError):
+                models = None
+        
+        if models is not None:
             print(f"找到 {len(models)} 个模型文件:")
-            for model in models:
-                size = model.stat().st_size / (1024*1024)
-                print(f"  🧠 {model.name}: {size:.1f} MB")
+            for name, size_bytes in models:
+                size = size_bytes / (1024*1024)
+                print(f"  🧠 {name}: {size:.1f} MB")
         else:
             print("❌ 模型路径不存在或为空")
             
@@ -5,6 +5,7 @@ EasyOCR离线补丁
 """
 
 import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -53,17 +54,33 @@ def patch_easyocr_for_offline():
                 
                 os.makedirs(easyocr_model_dir, exist_ok=True)
                 
-                # 链接模型文件
-                for model_file in os.listdir(model_dir):
-                    if model_file.endswith('.pth'):
-                        src = os.path.join(model_dir, model_file)
-                        dst = os.path.join(easyocr_model_dir, model_file)
-                        if not os.path.exists(dst):
+                # 单次scandir收集模型文件
+                with os.scandir(model_dir) as it:
+                    pth = [e for e in it if e.name.endswith('.pth')]
+                
+                # 已镜像的模型直接跳过，避免逐个stat
+                with os.scandir(easyocr_model_dir) as it:
+                    existing = {e.name for e in it}
+                
+                if {e.name for e in pth}.issubset(existing):
+                    print("✅ Models already mirrored")
+                else:
+                    # 链接模型文件（硬链接失败时回退到复制）
+                    # 只用第一个文件探测一次硬链接能力，不在每个文件上重复抛异常
+                    can_hardlink = None
+                    for entry in pth:
+                        if entry.name in existing:
+                            continue
+                        dst = os.path.join(easyocr_model_dir, entry.name)
+                        if can_hardlink is not False:
                             try:
-                                os.link(src, dst)
-                            except:
-                                import shutil
-                                shutil.copy2(src, dst)
+                                os.link(entry.path, dst)
+                                can_hardlink = True
+                                continue
+                            except OSError:
+                                if can_hardlink is None:
+                                    can_hardlink = False
+                        shutil.copy2(entry.path, dst)
                 
                 # 设置HOME环境变量
                 if os.name == 'nt':
@@ -103,15 +103,14 @@ class ForceSingleModelPath:
         # 2. 检查模型文件
         model_dir = Path(single_path)
         if model_dir.exists():
-            models = list(model_dir.glob("*.pth"))
+            # 单次scandir收集所有模型文件名
+            with os.scandir(model_dir) as it:
+                models = {e.name for e in it if e.name.endswith('.pth')}
             print(f"📦 找到模型文件: {len(models)} 个")
             
             # 检查关键模型
             required = ['craft_mlt_25k.pth', 'zh_sim_g2.pth']
-            missing = []
-            for req in required:
-                if not any(m.name == req for m in models):
-                    missing.append(req)
+            missing = [req for req in required if req not in models]
             
             if missing:
                 print(f"⚠️ 缺少关键模型: {missing}")
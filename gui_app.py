@@ -21,7 +21,10 @@ class MonitorOCRApp:
         self.config_manager = ConfigManager()
         self.camera_manager = CameraManager()
         self.storage_manager = StorageManager(
-            self.config_manager.get('storage.screenshot_dir', './screenshots')
+            self.config_manager.get('storage.screenshot_dir', './screenshots'),
+            self.config_manager.get('storage.image_format', 'jpg'),
+            self.config_manager.get('storage.jpeg_quality', 95),
+            self.config_manager.get('storage.async_save', False)
         )
         self.ocr_processor = OCRProcessor(self.config_manager.get_ocr_config())
         self.screenshot_manager = ScreenshotManager()
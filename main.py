@@ -49,8 +49,6 @@ if getattr(sys, 'frozen', False):
         except ImportError:
             pass
 
-from gui_app import MonitorOCRApp
-from model_path_manager import ModelPathManager
 from simple_logger import get_logger, log_info, log_error
 
 def main():
@@ -93,7 +91,10 @@ def main():
         config_manager = ConfigManager(args.config)
         camera_manager = CameraManager()
         storage_manager = StorageManager(
-            config_manager.get('storage.screenshot_dir', './screenshots')
+            config_manager.get('storage.screenshot_dir', './screenshots'),
+            config_manager.get('storage.image_format', 'jpg'),
+            config_manager.get('storage.jpeg_quality', 95),
+            config_manager.get('storage.async_save', False)
         )
         ocr_processor = OCRProcessor(config_manager.get_ocr_config())
         http_server = HTTPServer(
@@ -142,8 +143,9 @@ def main():
             return 1
     
     else:
-        # GUI模式
+        # GUI模式（界面及其依赖的OCR/图像模块只在此分支导入，--no-gui/--debug 无需加载tkinter）
         try:
+            from gui_app import MonitorOCRApp
             app = MonitorOCRApp()
             app.run()
             return 0
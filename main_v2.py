@@ -77,8 +77,14 @@ class MonitorOCRV2:
         """初始化组件"""
         try:
             # 初始化存储管理器
-            storage_dir = self.config.get('storage', {}).get('screenshot_dir', './screenshots')
-            self.storage_manager = StorageManager(storage_dir)
+            storage_config = self.config.get('storage', {})
+            storage_dir = storage_config.get('screenshot_dir', './screenshots')
+            self.storage_manager = StorageManager(
+                storage_dir,
+                storage_config.get('image_format', 'jpg'),
+                storage_config.get('jpeg_quality', 95),
+                storage_config.get('async_save', False)
+            )
             logger.info("Storage manager initialized")
             
             # 初始化摄像头管理器
@@ -21,9 +21,19 @@ except ImportError:
 class ModelPathManager:
     """模型路径管理器 - 极简版本"""
     
+    # 缓存已解析的模型目录：(当前工作目录, 模型目录)，工作目录变化时重新解析
+    _model_dir_cache = None
+    # 已完成环境设置的模型目录，相同目录不重复设置
+    _env_model_path = None
+    
     @staticmethod 
     def get_easyocr_model_path(config=None):
         """获取EasyOCR模型路径 - 强制单一路径版本"""
+        cache_key = os.getcwd()
+        cached = ModelPathManager._model_dir_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
         # 优先使用强制单一路径管理器
         if _FORCE_AVAILABLE and getattr(sys, 'frozen', False):
             # 打包环境：使用强制单一路径
@@ -41,7 +51,8 @@ class ModelPathManager:
         if not hasattr(ModelPathManager, '_path_logged'):
             logger.info(f"EasyOCR模型目录: {model_dir}")
             if Path(model_dir).exists():
-                models = list(Path(model_dir).glob("*.pth"))
+                with os.scandir(model_dir) as it:
+                    models = [e.name for e in it if e.name.endswith('.pth')]
                 if models:
                     logger.info(f"找到 {len(models)} 个模型文件")
                 else:
@@ -50,11 +61,19 @@ class ModelPathManager:
                 logger.warning(f"模型目录不存在，请创建: {model_dir}")
             ModelPathManager._path_logged = True
         
+        ModelPathManager._model_dir_cache = (cache_key, model_dir)
         return model_dir
     
     @staticmethod
     def setup_easyocr_environment(config=None):
         """设置EasyOCR环境变量 - 强制单一路径版本"""
+        model_path = ModelPathManager.get_easyocr_model_path(config)
+        # 以解析出的目录（强制设置覆盖之前）为键，设置和补丁都成功后才记录
+        env_key = model_path
+        if ModelPathManager._env_model_path == env_key:
+            # 已为该目录设置过环境，跳过重复的设置和补丁
+            return True
+        
         # 在打包环境中使用强制单一路径管理器
         if _FORCE_AVAILABLE and getattr(sys, 'frozen', False):
             # 使用强制单一路径的完整设置
@@ -63,10 +82,10 @@ class ModelPathManager:
             ForceSingleModelPath.patch_easyocr_paths()
         else:
             # 开发环境或标准设置
-            model_path = ModelPathManager.get_easyocr_model_path(config)
             os.environ['EASYOCR_MODEL_PATH'] = model_path
             os.environ['TORCH_HOME'] = model_path
         
+        ModelPathManager._env_model_path = env_key
         return True
     
     @staticmethod
@@ -2,71 +2,93 @@ import cv2
 import numpy as np
 import re
 import os
+import hashlib
+import functools
+import threading
 from typing import Dict, List, Optional, Any
+from collections import OrderedDict
 from pathlib import Path
+from dataclasses import dataclass, field
 import sys
 from model_path_manager import ModelPathManager
-from simple_logger import log_info, log_error, log_warning
+from simple_logger import log_info, log_error, log_warning, log_debug, log_enabled
+
+# 数值提取（支持负数）
+_NUM_RE = re.compile(r'(-?\d+\.?\d*)')
+# 字段名之后的分隔符与数值
+_VALUE_TAIL = r'[：:\s]*(-?\d+\.?\d*)'
+# 字段名末尾的单位/极值后缀：英文括号前需有一个空格，如 " (rpm)"；中文括号如 "（max）"
+_SUFFIX_RE = re.compile(r'(?: \((rpm|max|min)\)|（(rpm|max|min)）)$')
+# 按识别文本缓存的字段提取结果上限
+_VALUES_CACHE_SIZE = 64
+
+
+def _split_field_suffix(field_name: str):
+    """拆分字段名为 (基础字段名, 后缀)，无后缀时后缀为空字符串"""
+    m = _SUFFIX_RE.search(field_name)
+    if not m:
+        return field_name, ""
+    return field_name[:m.start()], m.group(1) or m.group(2)
+
+
+@functools.lru_cache(maxsize=None)
+def _cuda_available() -> bool:
+    """检测CUDA是否可用，进程内只检测一次"""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+@dataclass
+class _TextIndex:
+    """单张图像识别文本的预计算索引，各字段提取共享"""
+    texts: List[str]
+    lowers: List[str]
+    joined: str
+    nums: List[List[str]]
+    # 按需计算、各字段共享的查询结果
+    _hits: Dict[str, List[int]] = field(default_factory=dict, repr=False)
+    _failed: Optional[List[int]] = field(default=None, repr=False)
+
+    def hits(self, needle: str) -> List[int]:
+        """包含needle的片段下标（按顺序），同一张图像内对相同needle只扫描一次"""
+        found = self._hits.get(needle)
+        if found is None:
+            found = self._hits[needle] = [i for i, text in enumerate(self.texts) if needle in text]
+        return found
+
+    def chinese_failed(self) -> List[int]:
+        """中文识别失败（含问号且含英文关键字）的片段下标，与字段无关，只计算一次"""
+        if self._failed is None:
+            self._failed = [
+                i for i, text in enumerate(self.texts)
+                if '?' in text and any(keyword in self.lowers[i] for keyword in ['max', 'min', 'mi', 'rpm'])
+            ]
+        return self._failed
+
+    @classmethod
+    def build(cls, texts: List[str]) -> "_TextIndex":
+        return cls(
+            texts=texts,
+            lowers=[text.lower() for text in texts],
+            joined=" ".join(texts),
+            nums=[_NUM_RE.findall(text) for text in texts],
+        )
+
 
 class OCRProcessor:
+    # 已加载的EasyOCR Reader缓存，键为 (lang_list, gpu, model_dir)
+    _reader_cache: Dict[tuple, Any] = {}
+
     def __init__(self, config: dict):
         self.config = config
         
         # EasyOCR-only版本，移除PaddleOCR支持
         self.easyocr_reader = None
         try:
-            # 在导入EasyOCR之前强制设置单一路径（打包环境）
-            if getattr(sys, 'frozen', False):
-                try:
-                    from force_single_model_path import ForceSingleModelPath
-                    log_info("打包环境：强制设置单一模型路径...")
-                    ForceSingleModelPath.setup_complete_force()
-                except ImportError:
-                    log_warning("强制单一路径管理器不可用，使用标准路径管理")
-            
-            import easyocr
-            log_info("初始化EasyOCR...")
-            
-            # 统一的模型路径管理
-            ModelPathManager.setup_easyocr_environment(config)
-            reader_params = ModelPathManager.get_easyocr_reader_params(config)
-            
-            easyocr_config = self.config.get('easyocr', {})
-            use_gpu = easyocr_config.get('use_gpu', False)
-            verbose = easyocr_config.get('verbose', False)  # 减少冗余日志
-            
-            # 使用ModelPathManager提供的参数作为基础
-            base_params = {
-                'lang_list': ['ch_sim', 'en'],
-                'gpu': use_gpu,
-                'verbose': verbose,
-            }
-            
-            # 合并ModelPathManager的参数
-            base_params.update(reader_params)
-            
-            # 移除None值的参数并只输出关键信息
-            base_params = {k: v for k, v in base_params.items() if v is not None}
-            log_info(f"EasyOCR GPU设置: {use_gpu}")
-            log_info(f"模型存储目录: {base_params.get('model_storage_directory', './easyocr_models')}")
-            log_info(f"EasyOCR初始化参数: {base_params}")
-            
-            try:
-                # 极简统一初始化：打包和开发环境使用相同逻辑
-                log_info("统一EasyOCR初始化...")
-                
-                # 强制禁用下载，只使用本地模型
-                final_params = base_params.copy()
-                final_params['download_enabled'] = False
-                
-                # 简单直接的初始化
-                self.easyocr_reader = easyocr.Reader(**final_params)
-                log_info("✅ EasyOCR初始化成功")
-
-            except Exception as e:
-                log_error(f"EasyOCR主要初始化流程失败: {e}")
-                # 不再进行回退尝试，直接设置为None
-                self.easyocr_reader = None
+            self.easyocr_reader = OCRProcessor.preload_reader(config)
             
             # 只有在真正初始化成功时才显示成功信息
             if self.easyocr_reader is not None:
@@ -79,192 +101,400 @@ class OCRProcessor:
             raise Exception(f"EasyOCR初始化失败，无法继续运行: {e}")
             
         self.field_mappings = config.get('field_mappings', {})
+        self._normalized_mappings = self._normalize_mappings(self.field_mappings)
         self.use_absolute_value = config.get('use_absolute_value', False)
+        
+        # 识别前的快速判断：标准差低于阈值视为空白图像（0为关闭）；
+        # 与上一帧完全相同时直接复用结果，字段映射变化后自动失效
+        self.blank_std_threshold = config.get('blank_std_threshold', 3.0)
+        self._last_frame = None  # (图像摘要, 字段映射, 提取结果)
+        
+        # 识别文本相同的图像提取结果也相同：按文本元组缓存（LRU），字段映射变化后清空；
+        # HTTP服务和GUI共用同一实例，缓存读写在锁内进行
+        self._values_cache = OrderedDict()
+        self._values_cache_mappings = self._normalized_mappings
+        self._values_lock = threading.Lock()
+    
+    @classmethod
+    def preload_reader(cls, config: dict):
+        """获取（必要时加载）EasyOCR Reader，相同参数的实例只初始化一次
+        
+        可在服务启动时调用以提前完成模型加载
+        """
+        easyocr_config = config.get('easyocr', {})
+        use_gpu = easyocr_config.get('use_gpu', False)
+        if use_gpu and not _cuda_available():
+            # 无CUDA时EasyOCR也会退回CPU；提前归一化，避免为同一CPU配置重复加载Reader
+            log_warning("配置启用了GPU但CUDA不可用，使用CPU")
+            use_gpu = False
+        lang_list = ['ch_sim', 'en']
+        model_dir = ModelPathManager.get_easyocr_model_path(config)
+        
+        key = (tuple(lang_list), use_gpu, model_dir)
+        reader = cls._reader_cache.get(key)
+        if reader is not None:
+            log_info("复用已加载的EasyOCR Reader")
+            return reader
+        
+        # 在导入EasyOCR之前强制设置单一路径（打包环境）
+        if getattr(sys, 'frozen', False):
+            try:
+                from force_single_model_path import ForceSingleModelPath
+                log_info("打包环境：强制设置单一模型路径...")
+                ForceSingleModelPath.setup_complete_force()
+            except ImportError:
+                log_warning("强制单一路径管理器不可用，使用标准路径管理")
+        
+        import easyocr
+        log_info("初始化EasyOCR...")
+        
+        # 统一的模型路径管理
+        ModelPathManager.setup_easyocr_environment(config)
+        reader_params = ModelPathManager.get_easyocr_reader_params(config)
+        
+        verbose = easyocr_config.get('verbose', False)  # 减少冗余日志
+        
+        # 使用ModelPathManager提供的参数作为基础
+        base_params = {
+            'lang_list': lang_list,
+            'gpu': use_gpu,
+            'verbose': verbose,
+        }
+        
+        # 合并ModelPathManager的参数
+        base_params.update(reader_params)
+        
+        # 移除None值的参数并只输出关键信息
+        base_params = {k: v for k, v in base_params.items() if v is not None}
+        log_info(f"EasyOCR GPU设置: {use_gpu}")
+        log_info(f"模型存储目录: {base_params.get('model_storage_directory', './easyocr_models')}")
+        log_info(f"EasyOCR初始化参数: {base_params}")
+        
+        try:
+            # 极简统一初始化：打包和开发环境使用相同逻辑
+            log_info("统一EasyOCR初始化...")
+            
+            # 强制禁用下载，只使用本地模型
+            final_params = base_params.copy()
+            final_params['download_enabled'] = False
+            
+            # 简单直接的初始化
+            reader = easyocr.Reader(**final_params)
+            log_info("✅ EasyOCR初始化成功")
+
+        except Exception as e:
+            log_error(f"EasyOCR主要初始化流程失败: {e}")
+            # 不再进行回退尝试，直接返回None
+            return None
+        
+        cls._reader_cache[key] = reader
+        return reader
     
     def process_image(self, image: np.ndarray) -> Dict[str, str]:
         """处理图像并提取字段值"""
+        return self.process_images([image])[0]
+    
+    @staticmethod
+    def _frame_digest(image: np.ndarray) -> bytes:
+        """图像内容摘要（含尺寸），用于判断与上一帧是否相同"""
+        h = hashlib.blake2b(repr(image.shape).encode(), digest_size=16)
+        h.update(memoryview(np.ascontiguousarray(image)).cast('B'))
+        return h.digest()
+    
+    def _empty_values(self) -> Dict[str, None]:
+        """未找到任何字段时的结果：所有映射的key都为None"""
+        return {mapped_key: None for _, mapped_keys, _ in self._normalized_mappings for mapped_key in mapped_keys}
+    
+    def _is_blank(self, image: np.ndarray) -> bool:
+        """各通道标准差都低于阈值时视为空白图像，无需识别"""
+        if self.blank_std_threshold <= 0:
+            return False
+        _, std = cv2.meanStdDev(image)
+        return float(std.max()) < self.blank_std_threshold
+    
+    def process_images(self, images: List[np.ndarray]) -> List[Dict[str, str]]:
+        """批量处理图像并提取字段值，相同尺寸的图像在一次readtext_batched调用中完成检测/识别"""
         try:
             # 检查EasyOCR引擎可用性
             if self.easyocr_reader is None:
                 log_error("EasyOCR引擎不可用")
-                return {}
-            
-            # 针对中文字符优化的图像预处理
-            height, width = image.shape[:2]
-            print(f"原始图像尺寸: {image.shape}")
-            
-            # 确保图像有足够的分辨率用于中文识别
-            target_height = 600
-            if height < target_height:
-                scale = target_height / height
-                new_width = int(width * scale)
-                new_height = int(height * scale)
-                image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
-                print(f"图像放大到: {image.shape}")
+                return [{} for _ in images]
             
-            # 专门针对中文字符的图像处理
-            if len(image.shape) == 3:
-                # 1. 转换为灰度图进行处理
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                
-                # 2. 使用高斯模糊去噪
-                blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-                
-                # 3. 自适应阈值处理，更适合中文字符
-                adaptive_thresh = cv2.adaptiveThreshold(
-                    blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                    cv2.THRESH_BINARY, 11, 2
-                )
-                
-                # 4. 形态学操作，改善字符连通性
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-                processed = cv2.morphologyEx(adaptive_thresh, cv2.MORPH_CLOSE, kernel)
-                
-                # 5. 转回BGR格式
-                processed_image = cv2.cvtColor(processed, cv2.COLOR_GRAY2BGR)
-            else:
-                processed_image = image
-            
-            # 保存处理后的图像用于调试
-            cv2.imwrite("debug_chinese_optimized.jpg", processed_image)
-            print("已保存中文优化处理后的图像: debug_chinese_optimized.jpg")
+            # 空白图像和与上一帧相同的图像跳过识别
+            outputs: List[Optional[Dict[str, str]]] = [None] * len(images)
+            digests = [self._frame_digest(image) for image in images]
+            last = self._last_frame
+            pending = []
+            for i, image in enumerate(images):
+                if last is not None and last[0] == digests[i] and last[1] is self._normalized_mappings:
+                    log_info("图像与上一帧相同，复用识别结果")
+                    outputs[i] = dict(last[2])
+                elif self._is_blank(image):
+                    log_info("图像为空白，跳过识别")
+                    outputs[i] = self._empty_values()
+                else:
+                    pending.append(i)
+            if not pending:
+                return outputs
             
-            print(f"最终处理图像尺寸: {processed_image.shape}")
+            processed_images = [self._preprocess_image(images[i]) for i in pending]
             
             # 使用EasyOCR进行识别
-            texts = []
             log_info("使用EasyOCR进行识别...")
             try:
-                results = self.easyocr_reader.readtext(image, detail=1)
-                log_info(f"EasyOCR识别到 {len(results)} 个文本区域:")
-                
-                for idx, (bbox, text, prob) in enumerate(results):
-                    texts.append(text)
-                    log_info(f"  {idx+1}. '{text}' (置信度: {prob:.2f})")
-                
-                if not texts:
-                    log_warning("EasyOCR未识别到任何文本")
-                    return {}
-                    
+                ocr_cfg = self.config.get('easyocr', {})
+                # 置信度只在DEBUG日志中使用，其余情况直接取文本列表
+                batch_params = {
+                    'batch_size': ocr_cfg.get('batch_size', 4),
+                    'workers': ocr_cfg.get('workers', 0),
+                    'paragraph': False,
+                    'detail': 1 if log_enabled('DEBUG') else 0,
+                }
+                # readtext_batched要求输入尺寸一致：按尺寸分组分别批量识别，
+                # 不统一缩放，保证结果与逐张识别一致
+                groups: Dict[tuple, List[int]] = {}
+                for j, img in enumerate(processed_images):
+                    groups.setdefault(img.shape, []).append(j)
+                results_list = [None] * len(processed_images)
+                for idxs in groups.values():
+                    batch = self.easyocr_reader.readtext_batched(
+                        [processed_images[j] for j in idxs], **batch_params)
+                    for j, results in zip(idxs, batch):
+                        results_list[j] = results
             except Exception as e:
                 log_error(f"EasyOCR识别失败: {e}")
-                return {}
-            
-            # 根据字段映射提取值 - 支持一对多映射
-            extracted_values = {}
-            print(f"开始字段匹配，映射: {self.field_mappings}")
-            
-            for field_name, mapped_keys in self.field_mappings.items():
-                print(f"查找字段: '{field_name}'")
-                value = self._extract_field_value(texts, field_name)
-                
-                # 支持向后兼容：mapped_keys可以是字符串或数组
-                if isinstance(mapped_keys, str):
-                    mapped_keys = [mapped_keys]
-                elif not isinstance(mapped_keys, list):
-                    print(f"  警告: 字段 '{field_name}' 的映射格式错误，跳过")
-                    continue
-                
-                if value:
-                    # 处理数值（绝对值等）
-                    processed_value = self._process_numeric_value(value)
-                    
-                    # 将相同的值设置到所有映射的key中
-                    for mapped_key in mapped_keys:
-                        extracted_values[mapped_key] = processed_value
-                        print(f"  找到: {mapped_key} = {processed_value}")
-                else:
-                    # 为未找到的字段，所有映射的key都设置为None
-                    for mapped_key in mapped_keys:
-                        extracted_values[mapped_key] = None
-                        print(f"  未找到字段 '{field_name}' -> {mapped_key} = None")
+                return [{} for _ in images]
             
-            print(f"最终结果: {extracted_values}")
-            return extracted_values
+            mappings = self._normalized_mappings
+            for i, results in zip(pending, results_list):
+                outputs[i] = self._extract_values(results)
+            last_i = pending[-1]
+            self._last_frame = (digests[last_i], mappings, dict(outputs[last_i]))
+            return outputs
             
         except Exception as e:
             print(f"OCR处理错误: {e}")
             import traceback
             traceback.print_exc()
+            return [{} for _ in images]
+    
+    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
+        """图像预处理，返回送入EasyOCR的图像
+
+        EasyOCR内部会自行灰度化，其CRAFT检测器也更适合自然图像，
+        默认只做放大；配置 preprocess='threshold' 时使用旧的二值化流程。
+        """
+        log_debug("原始图像尺寸: %s", image.shape)
+
+        threshold = self.config.get('preprocess', 'none') == 'threshold'
+        # 二值化流程只使用灰度图：先转灰度再放大，缩放的数据量减为1/3
+        if threshold and len(image.shape) == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        # 确保图像有足够的分辨率用于中文识别
+        height, width = image.shape[:2]
+        target_height = 600
+        if height < target_height:
+            scale = target_height / height
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+            log_debug("图像放大到: %s", image.shape)
+
+        if not threshold:
+            self._dump_preprocessed(image)
+            return image
+
+        # 专门针对中文字符的图像处理（UMat：OpenCL可用时自动走GPU/SIMD）
+        gray = cv2.UMat(image)
+
+        # 1. 使用高斯模糊去噪
+        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        # 2. 自适应阈值处理，更适合中文字符
+        adaptive_thresh = cv2.adaptiveThreshold(
+            blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY, 11, 2
+        )
+
+        # 3. 形态学操作，改善字符连通性
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+        processed_image = cv2.morphologyEx(adaptive_thresh, cv2.MORPH_CLOSE, kernel).get()
+        
+        self._dump_preprocessed(processed_image)
+        
+        log_debug("最终处理图像尺寸: %s", processed_image.shape)
+        return processed_image
+    
+    def _dump_preprocessed(self, image: np.ndarray):
+        """保存实际送入OCR的图像用于调试（默认关闭，PNG低压缩级别编码更快）"""
+        if self.config.get('debug_dump_preprocessed', False):
+            cv2.imwrite("debug_chinese_optimized.png", image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+            log_debug("已保存中文优化处理后的图像: debug_chinese_optimized.png")
+    
+    def _extract_values(self, results: list) -> Dict[str, str]:
+        """根据单张图像的识别结果按字段映射提取值"""
+        log_info("EasyOCR识别到 %d 个文本区域:", len(results))
+        
+        # detail=0 时结果即文本列表；detail=1 时为 (bbox, text, prob)
+        if results and not isinstance(results[0], str):
+            texts = [text for _, text, _ in results]
+            for idx, (_, text, prob) in enumerate(results):
+                log_debug("  %d. '%s' (置信度: %.2f)", idx + 1, text, prob)
+        else:
+            texts = list(results)
+        
+        if not texts:
+            log_warning("EasyOCR未识别到任何文本")
             return {}
+        
+        mappings = self._normalized_mappings
+        text_key = tuple(texts)
+        with self._values_lock:
+            if self._values_cache_mappings is not mappings:
+                self._values_cache.clear()
+                self._values_cache_mappings = mappings
+            cached = self._values_cache.get(text_key)
+            if cached is not None:
+                self._values_cache.move_to_end(text_key)
+        if cached is not None:
+            log_info("识别文本与之前相同，复用字段提取结果")
+            return dict(cached)
+        
+        # 每张图像只构建一次文本索引，所有字段共享
+        index = _TextIndex.build(texts)
+        
+        # 根据字段映射提取值 - 支持一对多映射
+        extracted_values = {}
+        log_debug("开始字段匹配，映射: %s", self.field_mappings)
+        
+        for field_name, mapped_keys, patterns in mappings:
+            log_debug("查找字段: '%s'", field_name)
+            value = self._extract_field_value(texts, field_name, index, patterns)
+            
+            if value:
+                # 处理数值（绝对值等）
+                processed_value = self._process_numeric_value(value)
+                
+                # 将相同的值设置到所有映射的key中
+                for mapped_key in mapped_keys:
+                    extracted_values[mapped_key] = processed_value
+                    log_debug("  找到: %s = %s", mapped_key, processed_value)
+            else:
+                # 为未找到的字段，所有映射的key都设置为None
+                for mapped_key in mapped_keys:
+                    extracted_values[mapped_key] = None
+                    log_debug("  未找到字段 '%s' -> %s = None", field_name, mapped_key)
+        
+        log_debug("最终结果: %s", extracted_values)
+        with self._values_lock:
+            # 提取期间字段映射已变化时不写入缓存
+            if self._values_cache_mappings is mappings:
+                self._values_cache[text_key] = extracted_values
+                if len(self._values_cache) > _VALUES_CACHE_SIZE:
+                    self._values_cache.popitem(last=False)
+        return dict(extracted_values)
     
-    def _extract_field_value(self, texts: List[str], field_name: str) -> Optional[str]:
+    def _extract_field_value(self, texts: List[str], field_name: str,
+                             index: Optional[_TextIndex] = None,
+                             patterns: Optional[List[re.Pattern]] = None) -> Optional[str]:
         """从文本列表中提取指定字段的值"""
-        log_info(f"  查找字段 '{field_name}' 在文本中...")
+        log_info("  查找字段 '%s' 在文本中...", field_name)
+        if index is None:
+            index = _TextIndex.build(texts)
+        if patterns is None:
+            patterns = self._compile_field_patterns(field_name)
 
         # 方法1：使用模式匹配全文
-        result = self._extract_with_patterns(texts, field_name)
+        result = self._extract_with_patterns(index, field_name, patterns)
         if result:
             return result
         
-        # 方法2：逐个分析文本片段
+        # 方法2：后备方案（查找字段名附近的数字）
+        result = self._fallback_extraction(index, field_name)
+        if result:
+            return result
+        
+        # 方法3：逐个分析文本片段
+        # 所有模式都以基础字段名开头，不含该字面量的片段可直接跳过。仅在基础字段名
+        # 无大小写之分（如中文）且不含括号时预筛选，与忽略大小写/兼容括号的模式结果一致
+        base_field, _ = _split_field_suffix(field_name)
+        anchor = base_field if (
+            base_field.lower() == base_field.upper() and not any(c in base_field for c in "()（）")
+        ) else None
         for i, text in enumerate(texts):
-            log_info(f"  分析文本片段 {i+1}: '{text}'")
-            result = self._extract_value_from_text(text, field_name)
+            # 不含数字的片段不可能匹配出数值
+            if not index.nums[i]:
+                continue
+            if anchor and anchor not in text:
+                continue
+            log_info("  分析文本片段 %d: '%s'", i + 1, text)
+            result = self._extract_value_from_text(text, field_name, patterns)
             if result:
-                log_info(f"  在文本片段 {i+1} 找到数值: {result}")
+                log_info("  在文本片段 %d 找到数值: %s", i + 1, result)
                 return result
         
-        # 方法3：跨片段组合匹配（处理OCR拆分字段的情况）
-        result = self._extract_cross_fragment(texts, field_name)
+        # 方法4：跨片段组合匹配（处理OCR拆分字段的情况）
+        result = self._extract_cross_fragment(index, field_name)
         if result:
             return result
         
-        # 方法4：后备方案
-        result = self._fallback_extraction(texts, field_name)
-        if result:
-            return result
-        
-        log_warning(f"  未找到字段 '{field_name}' 的值")
+        log_warning("  未找到字段 '%s' 的值", field_name)
         return None
     
-    def _extract_value_from_text(self, text: str, field_name: str) -> Optional[str]:
+    def _extract_value_from_text(self, text: str, field_name: str,
+                                 patterns: Optional[List[re.Pattern]] = None) -> Optional[str]:
         """从单个文本中精确提取字段值 - 基于配置动态生成模式"""
         
         # 动态生成正则模式，基于字段名
-        patterns = self._generate_field_patterns(field_name)
+        if patterns is None:
+            patterns = self._compile_field_patterns(field_name)
         
         # 尝试匹配所有模式
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
         return None
     
+    def _compile_field_patterns(self, field_name: str) -> List[re.Pattern]:
+        """编译字段的全部匹配模式"""
+        return [re.compile(pattern, re.IGNORECASE) for pattern in self._generate_field_patterns(field_name)]
+    
     def _generate_field_patterns(self, field_name: str) -> List[str]:
-        """基于字段名动态生成匹配模式"""
+        """基于字段名动态生成匹配模式
+        
+        各模式按优先级依次对全文尝试，不合并为交替模式，避免靠后的模式在更靠前的位置抢先匹配
+        """
         patterns = []
         
         # 转义特殊字符，用于正则表达式
         escaped_field = re.escape(field_name)
         
         # 去掉括号内容的基础字段名
-        base_field = field_name
-        for suffix in [" (rpm)", " (max)", " (min)", "（rpm）", "（max）", "（min）"]:
-            base_field = base_field.replace(suffix, "")
+        base_field, _ = _split_field_suffix(field_name)
         
         escaped_base = re.escape(base_field)
         
         # 1. 精确匹配完整字段名（支持负数）
-        patterns.append(rf'{escaped_field}[：:\s]*(-?\d+\.?\d*)')
+        patterns.append(rf'{escaped_field}{_VALUE_TAIL}')
         
-        # 2. 处理中英文括号差异（支持负数）
+        # 2. 处理中英文括号差异（支持负数）；字段名不含括号时与模式1相同，无需重复
         normalized_field = field_name.replace("(", "[（(]").replace(")", "[）)]")
         normalized_field = re.escape(normalized_field).replace(r'\[（\(]', '[（(]').replace(r'\[）\)]', '[）)]')
-        patterns.append(rf'{normalized_field}[：:\s]*(-?\d+\.?\d*)')
+        if normalized_field != escaped_field:
+            patterns.append(rf'{normalized_field}{_VALUE_TAIL}')
         
         # 3. 基础字段名匹配（去掉括号部分）- 仅当没有max/min区分时使用（支持负数）
         if base_field != field_name and not any(keyword in field_name for keyword in ["max", "min", "最大", "最小"]):
-            patterns.append(rf'{escaped_base}[：:\s]*(-?\d+\.?\d*)')
+            patterns.append(rf'{escaped_base}{_VALUE_TAIL}')
         
         # 4. 特殊处理：如果字段包含特定关键词，生成更宽泛的模式（支持负数）
         if any(keyword in field_name for keyword in ["max", "min", "最大", "最小"]):
             # 提取关键词
             if "(max)" in field_name or "（max）" in field_name:
-                patterns.append(rf'{escaped_base}.*?max.*?[：:\s]*(-?\d+\.?\d*)')
+                patterns.append(rf'{escaped_base}.*?max.*?{_VALUE_TAIL}')
             elif "(min)" in field_name or "（min）" in field_name:
-                patterns.append(rf'{escaped_base}.*?min.*?[：:\s]*(-?\d+\.?\d*)')
+                patterns.append(rf'{escaped_base}.*?min.*?{_VALUE_TAIL}')
         
         return patterns
     
@@ -275,203 +505,189 @@ class OCRProcessor:
             
         try:
             # 提取完整的数字（包括负号）
-            import re
-            match = re.search(r'(-?\d+\.?\d*)', value)
+            match = _NUM_RE.search(value)
             if match:
                 number_str = match.group(1)
                 if self.use_absolute_value:
-                    # 取绝对值，保持原始数据类型
-                    if '.' in number_str:
-                        # 浮点数
-                        abs_value = str(abs(float(number_str)))
-                    else:
-                        # 整数
-                        abs_value = str(abs(int(number_str)))
-                    log_info(f"  数值处理：{number_str} -> {abs_value} (取绝对值)")
+                    # 取绝对值，保持原始数据类型（浮点数/整数）
+                    number = float(number_str) if '.' in number_str else int(number_str)
+                    abs_value = str(abs(number))
+                    log_info("  数值处理：%s -> %s (取绝对值)", number_str, abs_value)
                     return abs_value
                 else:
                     # 保留原始值（包括负号）
-                    log_info(f"  数值处理：保留原始值 {number_str}")
+                    log_info("  数值处理：保留原始值 %s", number_str)
                     return number_str
             return value
         except Exception as e:
             log_warning(f"  数值处理出错: {e}, 返回原始值: {value}")
             return value
     
-    def _extract_cross_fragment(self, texts: List[str], field_name: str) -> Optional[str]:
+    def _extract_cross_fragment(self, index: _TextIndex, field_name: str) -> Optional[str]:
         """跨片段匹配：处理OCR将字段拆分成多个片段的情况"""
+        texts = index.texts
         
         # 提取字段关键信息
-        base_field = field_name
-        field_suffix = ""
+        base_field, field_suffix = _split_field_suffix(field_name)
+        if field_suffix not in ("max", "min"):
+            base_field, field_suffix = field_name, ""
         
-        for suffix in [" (max)", " (min)", "（max）", "（min）"]:
-            if suffix in field_name:
-                field_suffix = suffix.replace(" ", "").replace("（", "").replace("）", "").replace("(", "").replace(")", "")
-                base_field = base_field.replace(suffix, "")
-                break
-        
-        log_info(f"  跨片段匹配：查找 '{base_field}' + '{field_suffix}'")
+        log_info("  跨片段匹配：查找 '%s' + '%s'", base_field, field_suffix)
         
         # 查找包含基础字段的片段位置
-        base_indices = []
-        for i, text in enumerate(texts):
-            if base_field in text:
-                base_indices.append(i)
+        base_indices = index.hits(base_field)
         
         if not base_indices:
             return None
         
+        # 后缀命中情况只与片段有关，预先计算一次
+        if field_suffix:
+            suffix_patterns = (field_suffix, f"({field_suffix})", f"（{field_suffix}）")
+            has_suffix = [any(p in lower for p in suffix_patterns) for lower in index.lowers]
+        
+        # 相邻基础字段的查找窗口会重叠，已检查过的片段结果不会变化，直接跳过
+        checked = set()
+        
         # 对于每个基础字段位置，查找附近的后缀和数值
         for base_idx in base_indices:
-            log_info(f"  找到基础字段 '{base_field}' 在片段 {base_idx+1}: '{texts[base_idx]}'")
+            log_info("  找到基础字段 '%s' 在片段 %d: '%s'", base_field, base_idx + 1, texts[base_idx])
             
-            # 查找后缀在附近片段中的位置
-            for offset in range(-2, 3):  # 前后2个片段范围内查找
-                suffix_idx = base_idx + offset
-                if 0 <= suffix_idx < len(texts):
-                    text = texts[suffix_idx]
-                    
-                    # 检查是否包含目标后缀
-                    if field_suffix:
-                        # 对于max/min字段，需要精确匹配后缀
-                        if any(pattern in text.lower() for pattern in [field_suffix, f"({field_suffix})", f"（{field_suffix}）"]):
-                            log_info(f"  找到后缀 '{field_suffix}' 在片段 {suffix_idx+1}: '{text}'")
-                            
-                            # 在后缀片段和其后续片段中查找数字（支持负数）
-                            for num_offset in range(0, 3):
-                                num_idx = suffix_idx + num_offset
-                                if 0 <= num_idx < len(texts):
-                                    numbers = re.findall(r'(-?\d+\.?\d*)', texts[num_idx])
-                                    if numbers:
-                                        raw_value = numbers[0]
-                                        log_info(f"  跨片段匹配成功：在片段 {num_idx+1} '{texts[num_idx]}' 找到数值: {raw_value}")
-                                        return raw_value
-                    else:
-                        # 对于普通字段，直接在后续片段查找数字（支持负数）
-                        numbers = re.findall(r'(-?\d+\.?\d*)', text)
-                        if numbers:
-                            raw_value = numbers[0]
-                            log_info(f"  跨片段匹配成功：在片段 {suffix_idx+1} '{text}' 找到数值: {raw_value}")
-                            return raw_value
+            # 前后2个片段范围内查找
+            for suffix_idx in range(max(0, base_idx - 2), min(len(texts), base_idx + 3)):
+                if suffix_idx in checked:
+                    continue
+                checked.add(suffix_idx)
+                text = texts[suffix_idx]
+                
+                if field_suffix:
+                    # 对于max/min字段，需要精确匹配后缀
+                    if has_suffix[suffix_idx]:
+                        log_info("  找到后缀 '%s' 在片段 %d: '%s'", field_suffix, suffix_idx + 1, text)
+                        
+                        # 在后缀片段和其后续片段中查找数字（支持负数）
+                        for num_idx in range(suffix_idx, min(len(texts), suffix_idx + 3)):
+                            numbers = index.nums[num_idx]
+                            if numbers:
+                                raw_value = numbers[0]
+                                log_info("  跨片段匹配成功：在片段 %d '%s' 找到数值: %s", num_idx + 1, texts[num_idx], raw_value)
+                                return raw_value
+                else:
+                    # 对于普通字段，直接在后续片段查找数字（支持负数）
+                    numbers = index.nums[suffix_idx]
+                    if numbers:
+                        raw_value = numbers[0]
+                        log_info("  跨片段匹配成功：在片段 %d '%s' 找到数值: %s", suffix_idx + 1, text, raw_value)
+                        return raw_value
         
         return None
     
-    def _extract_with_patterns(self, texts: List[str], field_name: str) -> Optional[str]:
+    def _extract_with_patterns(self, index: _TextIndex, field_name: str,
+                               patterns: List[re.Pattern]) -> Optional[str]:
         """使用基于配置的模式匹配"""
         
-        # 基于字段名生成多种匹配模式
-        patterns = self._generate_field_patterns(field_name)
-        
         # 使用模式匹配全部文本
-        full_text = " ".join(texts)
+        full_text = index.joined
         for pattern in patterns:
-            match = re.search(pattern, full_text, re.IGNORECASE)
+            match = pattern.search(full_text)
             if match:
-                log_info(f"  通过模式 '{pattern}' 找到数值: {match.group(1)}")
+                log_info("  通过模式 '%s' 找到数值: %s", pattern.pattern, match.group(1))
                 return match.group(1)
         
-        # 最后的后备方案：查找字段名后紧跟的数字
-        return self._fallback_extraction(texts, field_name)
+        return None
     
-    def _fallback_extraction(self, texts: List[str], field_name: str) -> Optional[str]:
+    def _fallback_extraction(self, index: _TextIndex, field_name: str) -> Optional[str]:
         """后备提取方法：智能容错的邻近搜索"""
+        texts = index.texts
+        lowers = index.lowers
+        nums = index.nums
         
-        # 提取字段的关键信息
-        base_field = field_name
-        field_suffix = ""
+        # 清理基础字段名，保留关键的区分信息（max/min）
+        base_field, field_suffix = _split_field_suffix(field_name)
+        if field_suffix not in ("max", "min"):
+            field_suffix = ""
         
-        # 保留关键的区分信息
-        for suffix in [" (max)", " (min)", "（max）", "（min）"]:
-            if suffix in field_name:
-                field_suffix = suffix.replace(" ", "").replace("（", "").replace("）", "").replace("(", "").replace(")", "")
-                break
+        log_info("  后备方案：查找基础字段='%s', 后缀='%s'", base_field, field_suffix)
         
-        # 清理基础字段名
-        for suffix in [" (rpm)", " (max)", " (min)", "（rpm）", "（max）", "（min）"]:
-            base_field = base_field.replace(suffix, "")
-        
-        log_info(f"  后备方案：查找基础字段='{base_field}', 后缀='{field_suffix}'")
+        # 普通字段不需要下面针对max/min的各种策略
+        if not field_suffix:
+            return self._plain_neighbor_search(index, base_field)
         
         # 策略1：处理中文识别失败（识别为问号的情况）
-        chinese_failed_texts = []
-        for i, text in enumerate(texts):
-            if '?' in text and any(keyword in text.lower() for keyword in ['max', 'min', 'mi', 'rpm']):
-                chinese_failed_texts.append((i, text))
-                log_info(f"  检测到中文识别失败: 片段{i+1} '{text}'")
+        chinese_failed_texts = [(i, texts[i]) for i in index.chinese_failed()]
+        for i, text in chinese_failed_texts:
+            log_info("  检测到中文识别失败: 片段%d '%s'", i + 1, text)
         
-        if chinese_failed_texts and field_suffix in ["max", "min"]:
+        if chinese_failed_texts:
             # 基于英文关键字匹配
             for i, text in chinese_failed_texts:
-                if field_suffix == "max" and "max" in text.lower():
-                    numbers = re.findall(r'(-?\d+\.?\d*)', text)
+                if field_suffix == "max" and "max" in lowers[i]:
+                    numbers = nums[i]
                     if numbers:
-                        log_info(f"  中文识别失败修复：max字段 -> {numbers[0]}")
+                        log_info("  中文识别失败修复：max字段 -> %s", numbers[0])
                         return numbers[0]
-                elif field_suffix == "min" and ("min" in text.lower() or "mi" in text.lower()):
-                    numbers = re.findall(r'(-?\d+\.?\d*)', text)
+                elif field_suffix == "min" and ("min" in lowers[i] or "mi" in lowers[i]):
+                    numbers = nums[i]
                     if numbers:
-                        log_info(f"  中文识别失败修复：min字段 -> {numbers[0]}")
+                        log_info("  中文识别失败修复：min字段 -> %s", numbers[0])
                         return numbers[0]
         
-        # 对于max/min字段，使用智能匹配策略
-        if field_suffix in ["max", "min"]:
-            # 策略2：精确匹配
-            for i, text in enumerate(texts):
-                if base_field in text and field_suffix in text.lower():
-                    numbers = re.findall(r'(-?\d+\.?\d*)', text)
+        # 策略2：精确匹配
+        base_indices = index.hits(base_field)
+        for i in base_indices:
+            if field_suffix in lowers[i]:
+                numbers = nums[i]
+                if numbers:
+                    log_info("  后备方案：精确匹配 '%s' 中找到数值: %s", texts[i], numbers[0])
+                    return numbers[0]
+        
+        # 策略2：模糊匹配（处理OCR识别错误）
+        similar_patterns = {
+            "max": ["max", "nax", "mux", "mac"],
+            "min": ["min", "mix", "nin", "mir", "mic"]
+        }
+        
+        for i in base_indices:
+            for pattern in similar_patterns[field_suffix]:
+                if pattern in lowers[i]:
+                    numbers = nums[i]
                     if numbers:
-                        log_info(f"  后备方案：精确匹配 '{text}' 中找到数值: {numbers[0]}")
+                        log_info("  后备方案：模糊匹配 '%s' (模式: %s) 中找到数值: %s", texts[i], pattern, numbers[0])
                         return numbers[0]
+        
+        # 策略3：位置推断（基于顺序）
+        if len(base_indices) >= 2:
+            if field_suffix == "max":
+                # 第一个通常是max
+                numbers = nums[base_indices[0]]
+                if numbers:
+                    log_info("  后备方案：位置推断(第1个) '%s' 作为max: %s", texts[base_indices[0]], numbers[0])
+                    return numbers[0]
+            elif field_suffix == "min":
+                # 第二个通常是min
+                numbers = nums[base_indices[1]]
+                if numbers:
+                    log_info("  后备方案：位置推断(第2个) '%s' 作为min: %s", texts[base_indices[1]], numbers[0])
+                    return numbers[0]
+        
+        return None
+    
+    def _plain_neighbor_search(self, index: _TextIndex, base_field: str) -> Optional[str]:
+        """普通字段的邻近搜索：在字段所在片段及其后两个片段中查找数值"""
+        texts = index.texts
+        nums = index.nums
+        for i in index.hits(base_field):
+            # 在同一个文本中查找数字
+            numbers = nums[i]
+            if numbers:
+                log_info("  后备方案：在文本 '%s' 中找到数值: %s", texts[i], numbers[0])
+                return numbers[0]
             
-            # 策略2：模糊匹配（处理OCR识别错误）
-            similar_patterns = {
-                "max": ["max", "nax", "mux", "mac"],
-                "min": ["min", "mix", "nin", "mir", "mic"]
-            }
-            
-            if field_suffix in similar_patterns:
-                for i, text in enumerate(texts):
-                    if base_field in text:
-                        text_lower = text.lower()
-                        for pattern in similar_patterns[field_suffix]:
-                            if pattern in text_lower:
-                                numbers = re.findall(r'(-?\d+\.?\d*)', text)
-                                if numbers:
-                                    log_info(f"  后备方案：模糊匹配 '{text}' (模式: {pattern}) 中找到数值: {numbers[0]}")
-                                    return numbers[0]
-            
-            # 策略3：位置推断（基于顺序）
-            base_texts = [text for text in texts if base_field in text]
-            if len(base_texts) >= 2:
-                if field_suffix == "max":
-                    # 第一个通常是max
-                    numbers = re.findall(r'(-?\d+\.?\d*)', base_texts[0])
-                    if numbers:
-                        log_info(f"  后备方案：位置推断(第1个) '{base_texts[0]}' 作为max: {numbers[0]}")
-                        return numbers[0]
-                elif field_suffix == "min":
-                    # 第二个通常是min
-                    numbers = re.findall(r'(-?\d+\.?\d*)', base_texts[1])
-                    if numbers:
-                        log_info(f"  后备方案：位置推断(第2个) '{base_texts[1]}' 作为min: {numbers[0]}")
-                        return numbers[0]
-        else:
-            # 普通字段的邻近搜索
-            for i, text in enumerate(texts):
-                if base_field in text:
-                    # 在同一个文本中查找数字
-                    numbers = re.findall(r'(-?\d+\.?\d*)', text)
-                    if numbers:
-                        log_info(f"  后备方案：在文本 '{text}' 中找到数值: {numbers[0]}")
-                        return numbers[0]
-                    
-                    # 在后续文本中查找数字
-                    for j in range(i + 1, min(i + 3, len(texts))):
-                        numbers = re.findall(r'(-?\d+\.?\d*)', texts[j])
-                        if numbers:
-                            log_info(f"  后备方案：在后续文本 '{texts[j]}' 中找到数值: {numbers[0]}")
-                            return numbers[0]
+            # 在后续文本中查找数字
+            for j in range(i + 1, min(i + 3, len(texts))):
+                numbers = nums[j]
+                if numbers:
+                    log_info("  后备方案：在后续文本 '%s' 中找到数值: %s", texts[j], numbers[0])
+                    return numbers[0]
         
         return None
     
@@ -483,8 +699,24 @@ class OCRProcessor:
                 {"字段名": "单个key"} 或 {"字段名": ["key1", "key2"]}
         """
         self.field_mappings = mappings
+        self._normalized_mappings = self._normalize_mappings(mappings)
         print(f"字段映射已更新: {mappings}")
     
+    def _normalize_mappings(self, mappings: Dict[str, Any]) -> List[tuple]:
+        """预处理字段映射：统一为 (字段名, 映射key元组, 编译后的模式)
+        
+        mapped_keys可以是字符串或数组（向后兼容），格式错误的条目在此处跳过
+        """
+        normalized = []
+        for field_name, mapped_keys in mappings.items():
+            if isinstance(mapped_keys, str):
+                mapped_keys = [mapped_keys]
+            elif not isinstance(mapped_keys, list):
+                log_warning("  字段 '%s' 的映射格式错误，跳过", field_name)
+                continue
+            normalized.append((field_name, tuple(mapped_keys), self._compile_field_patterns(field_name)))
+        return normalized
+    
     def get_field_mappings(self) -> Dict[str, Any]:
         """获取当前字段映射"""
         return self.field_mappings.copy()
@@ -492,8 +724,10 @@ class OCRProcessor:
     def add_field_mapping(self, field_name: str, mapped_key: str):
         """添加字段映射"""
         self.field_mappings[field_name] = mapped_key
+        self._normalized_mappings = self._normalize_mappings(self.field_mappings)
     
     def remove_field_mapping(self, field_name: str):
         """删除字段映射"""
         if field_name in self.field_mappings:
             del self.field_mappings[field_name]
+            self._normalized_mappings = self._normalize_mappings(self.field_mappings)
@@ -4,22 +4,53 @@
 集成缓存、性能监控、错误处理等优化功能
 """
 
+import re
+import time
+import threading
+import functools
+from bisect import bisect_right
 import cv2
 import numpy as np
 import hashlib
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Tuple
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from pathlib import Path
 
 from logger_config import get_logger
-from performance_monitor import performance_monitor
+from performance_monitor import performance_monitor, performance_timer, monitor_memory, set_memory_sample_rate
 from cache_manager import OCRCache
-from error_handler import ErrorHandler, ErrorType, CircuitBreaker
+from error_handler import ErrorHandler, ErrorType, CircuitBreaker, retry_on_error
 from model_path_manager import ModelPathManager
 from config_validator import ConfigValidator
 
 logger = get_logger(__name__)
 
+
+@functools.lru_cache(maxsize=None)
+def _load_paddleocr():
+    """按需导入并创建PaddleOCR引擎，只在第一次调用时加载"""
+    from paddleocr import PaddleOCR
+    return PaddleOCR(
+        use_angle_cls=False,
+        lang='ch',
+        show_log=False
+    )
+
+@functools.lru_cache(maxsize=None)
+def _load_easyocr_reader(verbose: bool, model_storage_directory: Optional[str] = None):
+    """创建EasyOCR Reader，相同参数的实例在进程内共享，模型只加载一次"""
+    import easyocr
+    kwargs = {'gpu': False, 'verbose': verbose}
+    if model_storage_directory:
+        kwargs['model_storage_directory'] = model_storage_directory
+    return easyocr.Reader(['ch_sim', 'en'], **kwargs)
+
+# 数值匹配模式，模块加载时编译一次
+_NUM_RE = re.compile(r'\d+\.?\d*')
+
+# 按识别文本缓存的字段提取结果上限
+_FIELD_CACHE_SIZE = 256
+
 class OCRProcessorV2:
     """优化的OCR处理器"""
     
@@ -34,11 +65,15 @@ class OCRProcessorV2:
         self.cache = OCRCache(ttl=config.get('performance', {}).get('cache_ttl', 300))
         self.error_handler = ErrorHandler()
         self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
-        self.executor = ThreadPoolExecutor(max_workers=2)
         
         # OCR引擎配置
         self.ocr_engine = config.get('ocr', {}).get('engine', 'auto')
+        # auto模式下EasyOCR运行失败时才加载PaddleOCR作为备选
+        self._allow_fallback = self.ocr_engine == 'auto'
         self.field_mappings = config.get('ocr', {}).get('field_mappings', {})
+        self._clean_field_map = self._build_clean_field_map(self.field_mappings)
+        self._field_cache = OrderedDict()  # 识别文本键 -> 字段提取结果（LRU）
+        self._field_cache_lock = threading.Lock()  # process_image会被多个线程调用
         
         # 设置模型路径环境
         ModelPathManager.setup_easyocr_environment()
@@ -48,10 +83,21 @@ class OCRProcessorV2:
         self.paddleocr_engine = None
         self._initialize_ocr_engines()
         
+        # CLAHE对象可复用，避免每次预处理重新创建；其内部有状态，只在_lab_lock内使用
+        self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        
+        # LAB中间结果复用同一块缓冲区；该锁同时保护共享的CLAHE对象
+        self._lab_buf = None
+        self._lab_lock = threading.Lock()
+        
         # 性能设置
         self.max_image_size = config.get('performance', {}).get('max_image_size', 1920)
         self.ocr_timeout = config.get('performance', {}).get('ocr_timeout', 30)
         self.enable_cache = config.get('performance', {}).get('enable_cache', True)
+        self.denoise_mode = config.get('performance', {}).get('denoise_mode', 'gaussian')
+        set_memory_sample_rate(config.get('performance', {}).get('memory_monitor_sample_rate', 32))
+        self.contrast_threshold = config.get('performance', {}).get('contrast_threshold', 50.0)
+        self.noise_threshold = config.get('performance', {}).get('noise_threshold', 100.0)
         
         logger.info(f"OCRProcessorV2 initialized with engine: {self.ocr_engine}")
     
@@ -60,7 +106,8 @@ class OCRProcessorV2:
         # 优先尝试EasyOCR
         if self.ocr_engine in ['easyocr', 'auto']:
             try:
-                import easyocr
+                # 详细日志默认关闭，调试时可通过 ocr.easyocr.verbose 开启
+                verbose = self.config.get('ocr', {}).get('easyocr', {}).get('verbose', False)
                 
                 # 获取模型路径
                 model_path = ModelPathManager.get_easyocr_model_path()
@@ -69,27 +116,14 @@ class OCRProcessorV2:
                     
                     # 尝试指定模型目录（如果支持）
                     try:
-                        self.easyocr_reader = easyocr.Reader(
-                            ['ch_sim', 'en'],
-                            gpu=False,
-                            verbose=True,  # 临时启用详细日志帮助调试
-                            model_storage_directory=str(Path(model_path).parent)
-                        )
+                        self.easyocr_reader = _load_easyocr_reader(verbose, str(Path(model_path).parent))
                     except:
                         # 回退到默认初始化
                         logger.warning("Failed to use custom model path, using default")
-                        self.easyocr_reader = easyocr.Reader(
-                            ['ch_sim', 'en'],
-                            gpu=False,
-                            verbose=True
-                        )
+                        self.easyocr_reader = _load_easyocr_reader(verbose)
                 else:
                     logger.warning("No EasyOCR model path found, trying default initialization")
-                    self.easyocr_reader = easyocr.Reader(
-                        ['ch_sim', 'en'],
-                        gpu=False,
-                        verbose=True
-                    )
+                    self.easyocr_reader = _load_easyocr_reader(verbose)
                 
                 logger.info("EasyOCR engine initialized successfully")
                 if self.ocr_engine == 'auto':
@@ -103,12 +137,7 @@ class OCRProcessorV2:
         # 备选PaddleOCR
         if self.ocr_engine in ['paddleocr', 'auto'] and not self.easyocr_reader:
             try:
-                from paddleocr import PaddleOCR
-                self.paddleocr_engine = PaddleOCR(
-                    use_angle_cls=False,
-                    lang='ch',
-                    show_log=False
-                )
+                self.paddleocr_engine = _load_paddleocr()
                 logger.info("PaddleOCR engine initialized successfully")
                 if self.ocr_engine == 'auto':
                     self.ocr_engine = 'paddleocr'
@@ -136,8 +165,11 @@ class OCRProcessorV2:
         start_time = time.time()
         
         try:
+            # 先缩小到限制尺寸，后续哈希和预处理都在小图上进行
+            resized = self._resize_to_limit(image)
+            
             # 生成图像哈希用于缓存
-            image_hash = self._compute_image_hash(image)
+            image_hash = self._compute_image_hash(resized)
             
             # 检查缓存
             if self.enable_cache:
@@ -148,7 +180,7 @@ class OCRProcessorV2:
                     return cached_result
             
             # 预处理图像
-            processed_image = self._preprocess_image(image)
+            processed_image = self._preprocess_image(resized)
             
             # 使用熔断器保护的OCR识别
             ocr_result = self.circuit_breaker.call(
@@ -156,30 +188,7 @@ class OCRProcessorV2:
                 processed_image
             )
             
-            # 提取字段值
-            extracted_values = self._extract_fields(ocr_result)
-            
-            # 构建完整结果
-            result = {
-                'success': True,
-                'fields': extracted_values,
-                'raw_text': ocr_result.get('texts', []),
-                'confidence': ocr_result.get('confidence', 0),
-                'engine': self.ocr_engine,
-                'processing_time': time.time() - start_time,
-                'image_size': image.shape[:2],
-                'cached': False
-            }
-            
-            # 缓存结果
-            if self.enable_cache and extracted_values:
-                self.cache.set_ocr_result(image_hash, result, region)
-            
-            # 记录性能指标
-            performance_monitor.record_ocr_time(time.time() - start_time)
-            performance_monitor.record_success()
-            
-            return result
+            return self._finish_result(image, image_hash, region, ocr_result, start_time)
             
         except Exception as e:
             # 记录错误
@@ -198,18 +207,112 @@ class OCRProcessorV2:
                 'processing_time': time.time() - start_time
             }
     
-    def _compute_image_hash(self, image: np.ndarray) -> str:
-        """计算图像哈希值"""
+    def _compute_image_hash(self, image: np.ndarray) -> bytes:
+        """计算图像哈希值（128位BLAKE2b摘要，直接作为缓存键使用）"""
         # 降采样以加快哈希计算
-        small = cv2.resize(image, (64, 64))
-        return hashlib.md5(small.tobytes()).hexdigest()
+        small = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
+        # 直接通过缓冲区协议哈希，不用tobytes()复制一份
+        return hashlib.blake2b(memoryview(np.ascontiguousarray(small)), digest_size=16).digest()
     
-    @retry_on_error(max_attempts=2, delay=0.5)
-    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
-        """预处理图像"""
+    def process_images(self, images: List[np.ndarray], regions: Optional[List[Optional[Dict]]] = None) -> List[Dict[str, Any]]:
+        """
+        批量处理图像，结果顺序与输入一致
+        
+        先统一计算哈希并查询缓存，相同图像只识别一次；
+        EasyOCR可用时未命中的图像按尺寸分组调用readtext_batched识别，
+        批量识别失败时逐张识别，与单张处理一样可回退到PaddleOCR。
+        
+        Args:
+            images: 输入图像列表
+            regions: 可选的区域信息列表，与images一一对应
+            
+        Returns:
+            每张图像的提取结果
+        """
+        start_time = time.time()
+        if regions is None:
+            regions = [None] * len(images)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        
+        # 缩放、哈希并查询缓存，相同哈希和区域的图像合并处理
+        pending = {}  # (哈希, 区域键) -> [图像下标]
+        resized_images = {}
+        for i, (image, region) in enumerate(zip(images, regions)):
+            resized = self._resize_to_limit(image)
+            image_hash = self._compute_image_hash(resized)
+            
+            if self.enable_cache:
+                cached_result = self.cache.get_ocr_result(image_hash, region)
+                if cached_result:
+                    performance_monitor.record_success()
+                    results[i] = cached_result
+                    continue
+            
+            key = (image_hash, tuple(sorted(region.items())) if region else None)
+            if key not in pending:
+                pending[key] = []
+                resized_images[key] = resized
+            pending[key].append(i)
+        
+        if not pending:
+            return results
+        
+        keys = list(pending)
+        try:
+            processed = [self._preprocess_image(resized_images[key]) for key in keys]
+            ocr_results = self.circuit_breaker.call(self._perform_ocr_batch, processed)
+        except Exception as e:
+            self.error_handler.log_error(ErrorType.OCR_FAILURE, e, {'batch_size': len(keys)})
+            for key in keys:
+                for i in pending[key]:
+                    performance_monitor.record_failure()
+                    results[i] = {
+                        'success': False,
+                        'error': str(e),
+                        'fields': {},
+                        'engine': self.ocr_engine,
+                        'processing_time': time.time() - start_time
+                    }
+            return results
+        
+        for key, ocr_result in zip(keys, ocr_results):
+            for i in pending[key]:
+                results[i] = self._finish_result(images[i], key[0], regions[i], ocr_result, start_time)
+        
+        return results
+    
+    def _finish_result(self, image: np.ndarray, image_hash: bytes, region: Optional[Dict],
+                       ocr_result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """根据识别结果提取字段、构建完整结果并写入缓存"""
+        # 提取字段值（识别文本相同时直接复用上次的提取结果）
+        extracted_values = self._extract_fields_cached(ocr_result)
+        
+        # 构建完整结果
+        result = {
+            'success': True,
+            'fields': extracted_values,
+            'raw_text': ocr_result.get('texts', []),
+            'confidence': ocr_result.get('confidence', 0),
+            'engine': self.ocr_engine,
+            'processing_time': time.time() - start_time,
+            'image_size': image.shape[:2],
+            'cached': False
+        }
+        
+        # 缓存结果
+        if self.enable_cache and extracted_values:
+            self.cache.set_ocr_result(image_hash, result, region)
+        
+        # 记录性能指标
+        performance_monitor.record_ocr_time(time.time() - start_time)
+        performance_monitor.record_success()
+        
+        return result
+    
+    def _resize_to_limit(self, image: np.ndarray) -> np.ndarray:
+        """智能缩放：超过max_image_size时用INTER_AREA缩小，否则原样返回"""
         height, width = image.shape[:2]
         
-        # 智能缩放
         if max(height, width) > self.max_image_size:
             scale = self.max_image_size / max(height, width)
             new_width = int(width * scale)
@@ -217,36 +320,111 @@ class OCRProcessorV2:
             image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
             logger.debug(f"Image resized from {(width, height)} to {(new_width, new_height)}")
         
+        return image
+    
+    @retry_on_error(max_attempts=2, delay=0.5)
+    def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
+        """预处理图像（输入应已经过 _resize_to_limit 缩放）"""
         # 图像增强
         if len(image.shape) == 3:
-            # 转换到LAB色彩空间进行增强
-            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            
-            # CLAHE增强
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            l = clahe.apply(l)
+            needs_contrast, needs_denoise = self._probe_enhancement(image)
+            # 输入可能是调用方的原图，只有本方法新建的数组才能原地修改
+            owned = False
             
-            # 合并回RGB
-            enhanced = cv2.merge([l, a, b])
-            image = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
+            if self.easyocr_reader:
+                # EasyOCR内部只使用灰度图，直接转为单通道后增强，数据量减为1/3
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                owned = True
+                if needs_contrast:
+                    # CLAHE对象内部有状态，多线程共用时与LAB分支使用同一把锁
+                    with self._lab_lock:
+                        self._clahe.apply(image, dst=image)
+            elif needs_contrast:
+                # 转换到LAB色彩空间进行增强，只对L通道做CLAHE，原地写回避免split/merge
+                with self._lab_lock:
+                    if self._lab_buf is None or self._lab_buf.shape != image.shape:
+                        self._lab_buf = np.empty_like(image)
+                    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB, dst=self._lab_buf)
+                    l = cv2.extractChannel(lab, 0)
+                    cv2.insertChannel(self._clahe.apply(l, dst=l), lab, 0)
+                    
+                    # 转换回BGR
+                    image = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+                owned = True
             
-            # 降噪
-            image = cv2.bilateralFilter(image, 5, 75, 75)
+            # 降噪：默认使用可分离的高斯模糊，双边滤波开销大得多，仅按配置启用
+            if needs_denoise:
+                if self.denoise_mode == 'gaussian':
+                    if owned:
+                        cv2.GaussianBlur(image, (3, 3), 0, dst=image)
+                    else:
+                        image = cv2.GaussianBlur(image, (3, 3), 0)
+                elif self.denoise_mode == 'bilateral':
+                    # bilateralFilter不支持原地操作
+                    image = cv2.bilateralFilter(image, 5, 75, 75)
         
         return image
     
+    def _probe_enhancement(self, image: np.ndarray) -> Tuple[bool, bool]:
+        """在128x128缩略图上估计对比度和噪声，判断是否需要CLAHE增强和降噪
+        
+        Returns:
+            (是否需要对比度增强, 是否需要降噪)
+        """
+        probe = cv2.resize(image, (128, 128), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(probe, cv2.COLOR_BGR2GRAY)
+        
+        # 灰度标准差足够大说明对比度已经充分
+        needs_contrast = gray.std() <= self.contrast_threshold
+        # 拉普拉斯方差过低说明几乎没有高频噪声
+        needs_denoise = cv2.Laplacian(gray, cv2.CV_64F).var() >= self.noise_threshold
+        
+        logger.debug(f"Enhancement probe: contrast={needs_contrast}, denoise={needs_denoise}")
+        return needs_contrast, needs_denoise
+    
     def _perform_ocr(self, image: np.ndarray) -> Dict[str, Any]:
-        """执行OCR识别"""
-        future = self.executor.submit(self._ocr_worker, image)
+        """执行OCR识别
         
-        try:
-            result = future.result(timeout=self.ocr_timeout)
-            return result
-        except TimeoutError:
-            logger.error(f"OCR timeout after {self.ocr_timeout} seconds")
-            future.cancel()
-            raise TimeoutError(f"OCR processing exceeded {self.ocr_timeout} seconds")
+        识别主要在原生代码中执行且每次只有一个请求，直接在当前线程调用；
+        原生调用无法中途取消，超时只做记录。
+        """
+        start = time.perf_counter()
+        result = self._ocr_worker(image)
+        elapsed = time.perf_counter() - start
+        if elapsed > self.ocr_timeout:
+            logger.warning(f"OCR took {elapsed:.1f} seconds, exceeding timeout of {self.ocr_timeout} seconds")
+        return result
+    
+    def _perform_ocr_batch(self, images: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """批量执行OCR识别，EasyOCR使用readtext_batched，其余引擎逐张识别"""
+        if not self.easyocr_reader or len(images) == 1:
+            return [self._perform_ocr(image) for image in images]
+        
+        # readtext_batched要求输入尺寸一致：按尺寸分组批量识别，不统一缩放；
+        # 只有一张的尺寸直接逐张识别，保证结果与单张识别一致
+        groups: Dict[tuple, List[int]] = {}
+        for i, image in enumerate(images):
+            groups.setdefault(image.shape, []).append(i)
+        
+        ocr_results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        for idxs in groups.values():
+            if len(idxs) == 1:
+                ocr_results[idxs[0]] = self._perform_ocr(images[idxs[0]])
+                continue
+            try:
+                batch_results = self.easyocr_reader.readtext_batched([images[i] for i in idxs], detail=1)
+            except Exception as e:
+                # 逐张识别走与单张处理相同的PaddleOCR回退路径
+                logger.error(f"EasyOCR batch failed, falling back to per-image OCR: {e}")
+                for i in idxs:
+                    ocr_results[i] = self._perform_ocr(images[i])
+                continue
+            logger.debug(f"EasyOCR batch processed {len(idxs)} images")
+            for i, results in zip(idxs, batch_results):
+                texts = [text for _, text, _ in results]
+                confidences = [confidence for _, _, confidence in results]
+                ocr_results[i] = self._make_ocr_result(texts, confidences)
+        return ocr_results
     
     def _ocr_worker(self, image: np.ndarray) -> Dict[str, Any]:
         """OCR工作线程"""
@@ -265,62 +443,140 @@ class OCRProcessorV2:
                 
             except Exception as e:
                 logger.error(f"EasyOCR failed: {e}")
-                if not self.paddleocr_engine:
+                if not self._ensure_fallback():
                     raise
+                texts, confidences = self._run_paddleocr(image)
         
         elif self.paddleocr_engine:
-            # 使用PaddleOCR
+            texts, confidences = self._run_paddleocr(image)
+        
+        return self._make_ocr_result(texts, confidences)
+    
+    def _ensure_fallback(self):
+        """EasyOCR运行失败时按需加载备选的PaddleOCR引擎，不可用时返回None"""
+        if self.paddleocr_engine is None and self._allow_fallback:
             try:
-                result = self.paddleocr_engine.ocr(image)
-                if result and result[0]:
-                    for line in result[0]:
-                        if line and len(line) >= 2:
-                            if isinstance(line[1], (list, tuple)) and len(line[1]) >= 2:
-                                texts.append(line[1][0])
-                                confidences.append(line[1][1])
-                
-                logger.debug(f"PaddleOCR detected {len(texts)} text regions")
-                
+                self.paddleocr_engine = _load_paddleocr()
+                logger.info("PaddleOCR fallback engine initialized")
             except Exception as e:
-                logger.error(f"PaddleOCR failed: {e}")
-                raise
+                logger.warning(f"Failed to initialize PaddleOCR fallback: {e}")
+                self._allow_fallback = False
+        return self.paddleocr_engine
+    
+    def _run_paddleocr(self, image: np.ndarray) -> Tuple[List[str], List[float]]:
+        """使用PaddleOCR识别，返回 (文本列表, 置信度列表)"""
+        texts = []
+        confidences = []
+        try:
+            result = self.paddleocr_engine.ocr(image)
+            if result and result[0]:
+                for line in result[0]:
+                    if line and len(line) >= 2:
+                        if isinstance(line[1], (list, tuple)) and len(line[1]) >= 2:
+                            texts.append(line[1][0])
+                            confidences.append(line[1][1])
+            
+            logger.debug(f"PaddleOCR detected {len(texts)} text regions")
+            
+        except Exception as e:
+            logger.error(f"PaddleOCR failed: {e}")
+            raise
         
+        return texts, confidences
+    
+    @staticmethod
+    def _make_ocr_result(texts: List[str], confidences: List[float]) -> Dict[str, Any]:
+        """组装OCR识别结果"""
         avg_confidence = sum(confidences) / len(confidences) if confidences else 0
         
         return {
             'texts': texts,
             'confidences': confidences,
-            'confidence': avg_confidence
+            'confidence': avg_confidence,
+            '_text_key': hashlib.blake2b('\x1f'.join(texts).encode(), digest_size=8).digest()
         }
     
+    def _extract_fields_cached(self, ocr_result: Dict[str, Any]) -> Dict[str, str]:
+        """按识别文本缓存字段提取结果，画面数值不变时跳过重复提取"""
+        text_key = ocr_result.get('_text_key')
+        if text_key is None:
+            return self._extract_fields(ocr_result)
+        
+        with self._field_cache_lock:
+            cached = self._field_cache.get(text_key)
+            if cached is not None:
+                self._field_cache.move_to_end(text_key)
+        if cached is not None:
+            return dict(cached)
+        
+        field_map = self._clean_field_map
+        extracted = self._extract_fields(ocr_result)
+        with self._field_cache_lock:
+            # 提取期间配置已更新时不写入缓存
+            if self._clean_field_map is not field_map:
+                return dict(extracted)
+            self._field_cache[text_key] = extracted
+            if len(self._field_cache) > _FIELD_CACHE_SIZE:
+                self._field_cache.popitem(last=False)
+        return dict(extracted)
+    
     def _extract_fields(self, ocr_result: Dict[str, Any]) -> Dict[str, str]:
         """提取字段值"""
         texts = ocr_result.get('texts', [])
         extracted = {}
         
-        for field_name, mapped_key in self.field_mappings.items():
-            value = self._find_field_value(texts, field_name)
+        if not texts or not self._clean_field_map:
+            return extracted
+        
+        # 所有片段拼接为一个字符串，字段查找改为 str.find；没有数字时直接返回
+        joined = '\n'.join(texts)
+        if not _NUM_RE.search(joined):
+            return extracted
+        
+        # 记录每个片段在拼接字符串中的起始位置
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        
+        for clean_name, mapped_key in self._clean_field_map:
+            value = self._find_field_value(joined, starts, clean_name)
             if value:
                 extracted[mapped_key] = value
                 logger.debug(f"Extracted {mapped_key}: {value}")
         
         return extracted
     
-    def _find_field_value(self, texts: List[str], field_name: str) -> Optional[str]:
-        """查找字段值"""
-        import re
-        
-        # 清理字段名
-        clean_name = field_name.replace(" (rpm)", "").replace(" (max)", "").replace(" (min)", "").strip()
-        
-        # 在文本中查找
-        for i, text in enumerate(texts):
-            if clean_name in text:
-                # 查找后续的数值
-                for j in range(i, min(i + 3, len(texts))):
-                    numbers = re.findall(r'\d+\.?\d*', texts[j])
-                    if numbers:
-                        return numbers[0]
+    @staticmethod
+    def _build_clean_field_map(field_mappings: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """预先清理字段名，生成 (清理后字段名, 映射key) 列表"""
+        return [
+            (field_name.replace(" (rpm)", "").replace(" (max)", "").replace(" (min)", "").strip(), mapped_key)
+            for field_name, mapped_key in field_mappings.items()
+        ]
+    
+    def _find_field_value(self, joined: str, starts: List[int], clean_name: str) -> Optional[str]:
+        """查找字段值：在字段所在片段及其后两个片段中取第一个数值
+        
+        Args:
+            joined: 以换行符拼接的识别文本
+            starts: 每个片段在joined中的起始位置
+            clean_name: 已清理的字段名
+        """
+        pos = joined.find(clean_name)
+        while pos >= 0:
+            # 定位字段所在片段，数值搜索范围限定在该片段起的3个片段内
+            i = bisect_right(starts, pos) - 1
+            end = starts[i + 3] - 1 if i + 3 < len(starts) else len(joined)
+            match = _NUM_RE.search(joined, starts[i], end)
+            if match:
+                return match.group()
+            
+            # 未找到数值，从下一个片段继续查找字段名
+            if i + 1 >= len(starts):
+                break
+            pos = joined.find(clean_name, starts[i + 1])
         
         return None
     
@@ -328,9 +584,16 @@ class OCRProcessorV2:
         """更新配置"""
         self.config = config
         self.field_mappings = config.get('ocr', {}).get('field_mappings', {})
+        self._clean_field_map = self._build_clean_field_map(self.field_mappings)
+        with self._field_cache_lock:
+            self._field_cache.clear()
         self.max_image_size = config.get('performance', {}).get('max_image_size', 1920)
         self.ocr_timeout = config.get('performance', {}).get('ocr_timeout', 30)
         self.enable_cache = config.get('performance', {}).get('enable_cache', True)
+        self.denoise_mode = config.get('performance', {}).get('denoise_mode', 'gaussian')
+        set_memory_sample_rate(config.get('performance', {}).get('memory_monitor_sample_rate', 32))
+        self.contrast_threshold = config.get('performance', {}).get('contrast_threshold', 50.0)
+        self.noise_threshold = config.get('performance', {}).get('noise_threshold', 100.0)
         
         # 更新缓存TTL
         cache_ttl = config.get('performance', {}).get('cache_ttl', 300)
@@ -353,6 +616,5 @@ class OCRProcessorV2:
     
     def cleanup(self):
         """清理资源"""
-        self.executor.shutdown(wait=True)
         self.cache.clear()
         logger.info("OCR processor resources cleaned up")
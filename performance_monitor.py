@@ -7,41 +7,85 @@
 import time
 import psutil
 import functools
+import numpy as np
 from typing import Dict, List, Any, Callable
-from collections import deque
 from datetime import datetime
 from logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# 当前进程对象只创建一次，供内存采样复用
+_PROC = psutil.Process()
+
+# monitor_memory 每N次调用采样一次内存，避免每次调用都读取RSS
+_memory_sample_rate = 32
+
+
+def set_memory_sample_rate(rate: int):
+    """设置 monitor_memory 的采样间隔（每rate次调用采样一次）"""
+    global _memory_sample_rate
+    _memory_sample_rate = max(1, int(rate))
+
+class _RingBuffer:
+    """定长环形缓冲区：数值和时间戳分别存放在NumPy数组中"""
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.values = np.empty(size, dtype=np.float64)
+        self.timestamps = np.empty(size, dtype=np.int64)  # time.time_ns()
+        self.head = 0
+        self.count = 0
+    
+    def append(self, value: float):
+        """追加一个样本，缓冲区满时覆盖最旧的样本"""
+        self.values[self.head] = value
+        self.timestamps[self.head] = time.time_ns()
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+    
+    def mean(self) -> float:
+        """样本平均值，无样本时返回0"""
+        return float(self.values[:self.count].mean()) if self.count else 0
+    
+    def recent(self, n: int, key: str) -> List[Dict[str, Any]]:
+        """按时间顺序返回最近n个样本，仅在此处格式化时间戳"""
+        n = min(n, self.count)
+        indices = (self.head - np.arange(n, 0, -1)) % self.size
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(self.timestamps[i] / 1e9).isoformat(),
+                key: float(self.values[i])
+            }
+            for i in indices
+        ]
+    
+    def __len__(self) -> int:
+        return self.count
+
+
 class PerformanceMonitor:
     """性能监控器"""
     
     def __init__(self, max_history: int = 100):
         self.max_history = max_history
-        self.ocr_times = deque(maxlen=max_history)
-        self.screenshot_times = deque(maxlen=max_history)
-        self.memory_usage = deque(maxlen=max_history)
-        self.cpu_usage = deque(maxlen=max_history)
+        self.ocr_times = _RingBuffer(max_history)
+        self.screenshot_times = _RingBuffer(max_history)
+        self.memory_usage = _RingBuffer(max_history)
+        self.cpu_usage = _RingBuffer(max_history)
         self.success_count = 0
         self.failure_count = 0
         self.start_time = time.time()
     
     def record_ocr_time(self, duration: float):
         """记录OCR处理时间"""
-        self.ocr_times.append({
-            'timestamp': datetime.now().isoformat(),
-            'duration': duration
-        })
-        logger.debug(f"OCR processing took {duration:.3f} seconds")
+        self.ocr_times.append(duration)
+        logger.debug("OCR processing took %.3f seconds", duration)
     
     def record_screenshot_time(self, duration: float):
         """记录截图时间"""
-        self.screenshot_times.append({
-            'timestamp': datetime.now().isoformat(),
-            'duration': duration
-        })
-        logger.debug(f"Screenshot took {duration:.3f} seconds")
+        self.screenshot_times.append(duration)
+        logger.debug("Screenshot took %.3f seconds", duration)
     
     def record_success(self):
         """记录成功次数"""
@@ -55,19 +99,12 @@ class PerformanceMonitor:
         """更新系统指标"""
         try:
             # 内存使用
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / (1024 * 1024)
-            self.memory_usage.append({
-                'timestamp': datetime.now().isoformat(),
-                'memory_mb': memory_mb
-            })
+            memory_mb = _PROC.memory_info().rss / (1024 * 1024)
+            self.memory_usage.append(memory_mb)
             
             # CPU使用率
             cpu_percent = psutil.cpu_percent(interval=0.1)
-            self.cpu_usage.append({
-                'timestamp': datetime.now().isoformat(),
-                'cpu_percent': cpu_percent
-            })
+            self.cpu_usage.append(cpu_percent)
         except Exception as e:
             logger.error(f"Failed to update system metrics: {e}")
     
@@ -76,10 +113,10 @@ class PerformanceMonitor:
         self.update_system_metrics()
         
         # 计算平均值
-        avg_ocr_time = sum(t['duration'] for t in self.ocr_times) / len(self.ocr_times) if self.ocr_times else 0
-        avg_screenshot_time = sum(t['duration'] for t in self.screenshot_times) / len(self.screenshot_times) if self.screenshot_times else 0
-        avg_memory = sum(m['memory_mb'] for m in self.memory_usage) / len(self.memory_usage) if self.memory_usage else 0
-        avg_cpu = sum(c['cpu_percent'] for c in self.cpu_usage) / len(self.cpu_usage) if self.cpu_usage else 0
+        avg_ocr_time = self.ocr_times.mean()
+        avg_screenshot_time = self.screenshot_times.mean()
+        avg_memory = self.memory_usage.mean()
+        avg_cpu = self.cpu_usage.mean()
         
         # 计算成功率
         total_requests = self.success_count + self.failure_count
@@ -104,8 +141,8 @@ class PerformanceMonitor:
                 'uptime_hours': round(uptime_hours, 2)
             },
             'recent': {
-                'last_ocr_times': list(self.ocr_times)[-10:],
-                'last_screenshot_times': list(self.screenshot_times)[-10:]
+                'last_ocr_times': self.ocr_times.recent(10, 'duration'),
+                'last_screenshot_times': self.screenshot_times.recent(10, 'duration')
             }
         }
     
@@ -143,7 +180,7 @@ def performance_timer(func: Callable) -> Callable:
         try:
             result = func(*args, **kwargs)
             duration = time.time() - start_time
-            logger.debug(f"{func.__name__} executed in {duration:.3f} seconds")
+            logger.debug("%s executed in %.3f seconds", func.__name__, duration)
             return result
         except Exception as e:
             duration = time.time() - start_time
@@ -153,16 +190,22 @@ def performance_timer(func: Callable) -> Callable:
 
 
 def monitor_memory(threshold_mb: float = 500):
-    """内存监控装饰器"""
+    """内存监控装饰器（按 set_memory_sample_rate 设置的间隔抽样）"""
     def decorator(func: Callable) -> Callable:
+        call_count = 0
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            process = psutil.Process()
-            memory_before = process.memory_info().rss / (1024 * 1024)
+            nonlocal call_count
+            call_count += 1
+            if call_count % _memory_sample_rate:
+                return func(*args, **kwargs)
+            
+            memory_before = _PROC.memory_info().rss / (1024 * 1024)
             
             result = func(*args, **kwargs)
             
-            memory_after = process.memory_info().rss / (1024 * 1024)
+            memory_after = _PROC.memory_info().rss / (1024 * 1024)
             memory_increase = memory_after - memory_before
             
             if memory_increase > threshold_mb:
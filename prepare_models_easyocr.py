@@ -7,8 +7,46 @@ Ensure model files are downloaded before packaging
 
 import os
 import sys
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Cache of {model_dir: [(path, size_bytes), ...]} so download/list/copy share one directory scan
+_MODEL_INDEX = {}
+
+def _easyocr_model_files(model_dir):
+    """Return the .pth files in model_dir with their sizes, scanning the directory only once"""
+    key = str(model_dir)
+    if key not in _MODEL_INDEX:
+        with os.scandir(model_dir) as it:
+            _MODEL_INDEX[key] = [
+                (Path(entry.path), entry.stat().st_size)
+                for entry in it
+                if entry.name.endswith('.pth') and entry.is_file()
+            ]
+    return _MODEL_INDEX[key]
+
+def _copy_one(src, dst):
+    """Copy one file with metadata, preferring in-kernel copy_file_range (reflink on CoW filesystems)"""
+    copied = False
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                copied = remaining == 0
+        except OSError:
+            copied = False
+    if not copied:
+        # shutil.copyfile picks sendfile / fcopyfile / CopyFile2 per platform
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
 def download_easyocr_models():
     """Download required EasyOCR models"""
     print("Starting EasyOCR model download...")
@@ -18,20 +56,23 @@ def download_easyocr_models():
         
         # Initialize EasyOCR to download models
         print("Initializing EasyOCR with Chinese and English support...")
-        reader = easyocr.Reader(['ch_sim', 'en'], gpu=False, download_enabled=True, verbose=False)
+        # Constructing the Reader downloads any missing models; the instance itself is not needed
+        easyocr.Reader(['ch_sim', 'en'], gpu=False, download_enabled=True, verbose=False)
         print("✅ EasyOCR models downloaded successfully")
+        # The download may have added files, drop any earlier scan
+        _MODEL_INDEX.clear()
         
         # Check model files
         home_dir = Path.home()
         easyocr_model_dir = home_dir / ".EasyOCR" / "model"
         
         if easyocr_model_dir.exists():
-            model_files = list(easyocr_model_dir.glob("*.pth"))
+            model_files = _easyocr_model_files(easyocr_model_dir)
             print(f"Found {len(model_files)} EasyOCR model files:")
             
             total_size = 0
-            for model_file in model_files:
-                size = model_file.stat().st_size / (1024 * 1024)
+            for model_file, size_bytes in model_files:
+                size = size_bytes / (1024 * 1024)
                 total_size += size
                 print(f"  - {model_file.name}: {size:.1f} MB")
             
@@ -56,8 +97,8 @@ def download_paddle_models():
     try:
         from paddleocr import PaddleOCR
         
-        # Initialize PaddleOCR
-        ocr = PaddleOCR(
+        # Initialize PaddleOCR (downloads its models on construction)
+        PaddleOCR(
             use_angle_cls=False,
             lang='ch'
         )
@@ -103,8 +144,8 @@ def list_all_models():
     easyocr_dir = home_dir / ".EasyOCR" / "model"
     if easyocr_dir.exists():
         print("\nEasyOCR Models:")
-        for model in easyocr_dir.glob("*.pth"):
-            size = model.stat().st_size / (1024 * 1024)
+        for model, size_bytes in _easyocr_model_files(easyocr_dir):
+            size = size_bytes / (1024 * 1024)
             print(f"  ✓ {model.name}: {size:.1f} MB")
     else:
         print("\nEasyOCR Models: Not found")
@@ -125,8 +166,6 @@ def copy_models_for_packaging():
     """Copy model files to local directory for packaging"""
     print("\nCopying models for packaging...")
     
-    import shutil
-    
     # Create local model directories
     local_easyocr = Path("easyocr_models")
     local_paddle = Path("paddlex_models")
@@ -138,10 +177,16 @@ def copy_models_for_packaging():
     easyocr_source = home_dir / ".EasyOCR" / "model"
     
     if easyocr_source.exists():
-        for model_file in easyocr_source.glob("*.pth"):
-            dest = local_easyocr / model_file.name
-            shutil.copy2(model_file, dest)
-            print(f"  Copied: {model_file.name}")
+        model_files = [path for path, _ in _easyocr_model_files(easyocr_source)]
+        
+        def copy_model(model_file):
+            _copy_one(model_file, local_easyocr / model_file.name)
+            return model_file.name
+        
+        # Model files are large and independent, copy them in parallel
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for name in executor.map(copy_model, model_files):
+                print(f"  Copied: {name}")
     
     # Copy PaddleOCR models (optional)
     paddlex_source = home_dir / ".paddlex"
@@ -151,7 +196,7 @@ def copy_models_for_packaging():
             # Copy entire paddlex directory structure
             if local_paddle.exists():
                 shutil.rmtree(local_paddle)
-            shutil.copytree(paddlex_source, local_paddle)
+            shutil.copytree(paddlex_source, local_paddle, copy_function=_copy_one)
             print(f"  Copied PaddleOCR models to {local_paddle}")
     
     print("✅ Model files copied for packaging")
@@ -160,13 +205,17 @@ def copy_models_for_packaging():
 if __name__ == "__main__":
     success = True
     
-    # Download EasyOCR models (primary)
-    if not download_easyocr_models():
-        print("\n❌ EasyOCR model preparation failed (required)")
-        success = False
-    
-    # Download PaddleOCR models (optional fallback)
-    download_paddle_models()
+    # The two downloads use different servers and directories, run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Download EasyOCR models (primary)
+        easyocr_future = executor.submit(download_easyocr_models)
+        # Download PaddleOCR models (optional fallback)
+        paddle_future = executor.submit(download_paddle_models)
+        
+        if not easyocr_future.result():
+            print("\n❌ EasyOCR model preparation failed (required)")
+            success = False
+        paddle_future.result()
     
     if success:
         # List all models
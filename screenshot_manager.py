@@ -10,6 +10,14 @@ import platform
 from typing import Tuple, Optional, List
 import time
 import os
+import ctypes
+import threading
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
 
 try:
     import pyautogui
@@ -23,12 +31,46 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+# Win32截图缓存屏幕几何信息的有效期（秒）
+_WIN32_METRICS_TTL = 1.0
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    """GetDIBits使用的位图信息头"""
+    _fields_ = [
+        ('biSize', ctypes.c_uint32), ('biWidth', ctypes.c_int32), ('biHeight', ctypes.c_int32),
+        ('biPlanes', ctypes.c_uint16), ('biBitCount', ctypes.c_uint16), ('biCompression', ctypes.c_uint32),
+        ('biSizeImage', ctypes.c_uint32), ('biXPelsPerMeter', ctypes.c_int32), ('biYPelsPerMeter', ctypes.c_int32),
+        ('biClrUsed', ctypes.c_uint32), ('biClrImportant', ctypes.c_uint32),
+    ]
+
+def _get_dibits():
+    """返回声明了参数类型的GetDIBits；未声明时句柄和缓冲区指针会被按32位int传递，64位系统上被截断"""
+    from ctypes import wintypes
+    get_dibits = ctypes.windll.gdi32.GetDIBits
+    get_dibits.argtypes = [
+        wintypes.HDC, wintypes.HBITMAP, wintypes.UINT, wintypes.UINT,
+        ctypes.c_void_p, ctypes.POINTER(_BITMAPINFOHEADER), wintypes.UINT,
+    ]
+    get_dibits.restype = ctypes.c_int
+    return get_dibits
+
 class ScreenshotManager:
     def __init__(self):
         """初始化屏幕截图管理器"""
         self.system = platform.system()
         self.available_methods = self._check_available_methods()
         
+        # 默认返回通道反序的视图（不复制）；需要连续内存的调用方可设为True
+        self.contiguous_output = False
+        
+        # mss实例持有显示连接且与创建它的线程绑定，每个线程首次使用时创建并复用
+        self._mss_local = threading.local()
+        
+        # Win32截图的设备上下文、位图和像素缓冲区，分辨率不变时复用；
+        # HTTP服务和GUI共用同一实例，重建缓存和截图过程都在锁内进行
+        self._win32_state = None
+        self._win32_lock = threading.Lock()
+        
         # 设置pyautogui安全模式
         if PYAUTOGUI_AVAILABLE:
             pyautogui.FAILSAFE = True
@@ -37,6 +79,10 @@ class ScreenshotManager:
         """检查可用的截图方法"""
         methods = []
         
+        # mss直接读取帧缓冲，无编码和子进程开销，优先使用
+        if MSS_AVAILABLE:
+            methods.append('mss')
+        
         if PYAUTOGUI_AVAILABLE:
             methods.append('pyautogui')
         
@@ -75,16 +121,20 @@ class ScreenshotManager:
         捕获全屏截图
         
         Args:
-            method: 截图方法 ('auto', 'pyautogui', 'pil', 'screencapture', 'win32')
+            method: 截图方法 ('auto', 'mss', 'pyautogui', 'pil', 'screencapture', 'win32')
         
         Returns:
-            截图的numpy数组 (BGR格式)，失败返回None
+            截图的numpy数组 (BGR格式)，失败返回None。
+            mss/pyautogui/PIL方式返回的是只读视图（不连续），需要修改时请先复制，
+            或设置 contiguous_output = True
         """
         if method == 'auto':
             method = self.available_methods[0] if self.available_methods else 'pyautogui'
         
         try:
-            if method == 'pyautogui' and PYAUTOGUI_AVAILABLE:
+            if method == 'mss' and MSS_AVAILABLE:
+                return self._capture_with_mss()
+            elif method == 'pyautogui' and PYAUTOGUI_AVAILABLE:
                 return self._capture_with_pyautogui()
             elif method == 'pil' and PIL_AVAILABLE:
                 return self._capture_with_pil()
@@ -121,7 +171,9 @@ class ScreenshotManager:
             method = self.available_methods[0] if self.available_methods else 'pyautogui'
         
         try:
-            if method == 'pyautogui' and PYAUTOGUI_AVAILABLE:
+            if method == 'mss' and MSS_AVAILABLE:
+                return self._capture_with_mss({'left': x, 'top': y, 'width': width, 'height': height})
+            elif method == 'pyautogui' and PYAUTOGUI_AVAILABLE:
                 return self._capture_region_with_pyautogui(x, y, width, height)
             elif method == 'pil' and PIL_AVAILABLE:
                 return self._capture_region_with_pil(x, y, width, height)
@@ -136,33 +188,52 @@ class ScreenshotManager:
             print(f"区域截图失败: {e}")
             return None
     
+    def _to_bgr(self, screenshot) -> np.ndarray:
+        """PIL图像转为BGR数组：反转通道轴得到视图，不做cvtColor整图复制"""
+        screenshot_np = np.asarray(screenshot)
+        # RGB/RGBA -> BGR，仅调整步长
+        screenshot_bgr = screenshot_np[:, :, 2::-1]
+        if self.contiguous_output:
+            screenshot_bgr = np.ascontiguousarray(screenshot_bgr)
+        return screenshot_bgr
+    
+    def _capture_with_mss(self, monitor: Optional[dict] = None) -> Optional[np.ndarray]:
+        """使用mss截图，monitor为None时截取主显示器"""
+        sct = getattr(self._mss_local, 'sct', None)
+        if sct is None:
+            sct = self._mss_local.sct = mss.mss()
+        if monitor is None:
+            monitor = sct.monitors[1]
+        
+        raw = sct.grab(monitor)
+        # mss返回BGRA原始数据，去掉alpha通道即为BGR视图
+        screenshot_bgr = np.frombuffer(raw.bgra, dtype=np.uint8).reshape(raw.height, raw.width, 4)[:, :, :3]
+        if self.contiguous_output:
+            screenshot_bgr = np.ascontiguousarray(screenshot_bgr)
+        return screenshot_bgr
+    
     def _capture_with_pyautogui(self) -> Optional[np.ndarray]:
         """使用pyautogui截图"""
         screenshot = pyautogui.screenshot()
-        # PIL Image转换为numpy数组
-        screenshot_np = np.array(screenshot)
-        # RGB转BGR (OpenCV格式)
-        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-        return screenshot_bgr
+        return self._to_bgr(screenshot)
     
     def _capture_with_pil(self) -> Optional[np.ndarray]:
         """使用PIL截图"""
         screenshot = ImageGrab.grab()
-        screenshot_np = np.array(screenshot)
-        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-        return screenshot_bgr
+        return self._to_bgr(screenshot)
     
     def _capture_with_screencapture(self) -> Optional[np.ndarray]:
-        """使用macOS screencapture命令截图"""
+        """使用macOS screencapture命令截图（需经过临时文件和子进程，仅作为mss不可用时的备选）"""
         import subprocess
         import tempfile
         
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
+        # 临时文件使用未压缩的BMP，省去PNG的压缩和解压
+        with tempfile.NamedTemporaryFile(suffix='.bmp', delete=False) as temp_file:
             temp_path = temp_file.name
         
         try:
             # 使用screencapture命令
-            subprocess.run(['screencapture', '-x', temp_path], check=True)
+            subprocess.run(['screencapture', '-x', '-t', 'bmp', temp_path], check=True)
             
             # 读取图片
             screenshot = cv2.imread(temp_path)
@@ -175,70 +246,127 @@ class ScreenshotManager:
     
     def _capture_with_win32(self) -> Optional[np.ndarray]:
         """使用Windows API截图"""
-        try:
-            import win32gui
-            import win32ui
-            import win32con
-            
-            # 获取桌面窗口
-            hdesktop = win32gui.GetDesktopWindow()
-            
-            # 获取屏幕尺寸
-            width = win32api.GetSystemMetrics(win32con.SM_CXVIRTUALSCREEN)
-            height = win32api.GetSystemMetrics(win32con.SM_CYVIRTUALSCREEN)
-            left = win32api.GetSystemMetrics(win32con.SM_XVIRTUALSCREEN)
-            top = win32api.GetSystemMetrics(win32con.SM_YVIRTUALSCREEN)
-            
-            # 创建设备上下文
-            desktop_dc = win32gui.GetWindowDC(hdesktop)
-            img_dc = win32ui.CreateDCFromHandle(desktop_dc)
-            mem_dc = img_dc.CreateCompatibleDC()
-            
-            # 创建位图
-            screenshot = win32ui.CreateBitmap()
-            screenshot.CreateCompatibleBitmap(img_dc, width, height)
-            mem_dc.SelectObject(screenshot)
-            
-            # 复制屏幕内容
-            mem_dc.BitBlt((0, 0), (width, height), img_dc, (left, top), win32con.SRCCOPY)
-            
-            # 获取位图数据
-            bmpinfo = screenshot.GetInfo()
-            bmpstr = screenshot.GetBitmapBits(True)
+        with self._win32_lock:
+            try:
+                import win32api
+                import win32con
             
-            # 转换为numpy数组
-            img = np.frombuffer(bmpstr, dtype='uint8')
-            img.shape = (height, width, 4)
+                # 屏幕尺寸很少变化，缓存的几何信息每秒才重新查询一次
+                state = self._win32_state
+                now = time.monotonic()
+                if state is None or now - state['checked_at'] >= _WIN32_METRICS_TTL:
+                    geometry = (
+                        win32api.GetSystemMetrics(win32con.SM_XVIRTUALSCREEN),
+                        win32api.GetSystemMetrics(win32con.SM_YVIRTUALSCREEN),
+                        win32api.GetSystemMetrics(win32con.SM_CXVIRTUALSCREEN),
+                        win32api.GetSystemMetrics(win32con.SM_CYVIRTUALSCREEN),
+                    )
+                    # 分辨率变化时才重新创建GDI对象
+                    if state is None or state['geometry'] != geometry:
+                        self._release_win32()
+                        state = self._win32_state = self._create_win32_state(*geometry)
+                    state['checked_at'] = now
+                left, top, width, height = state['geometry']
             
-            # 删除alpha通道并转换为BGR
-            img = img[:, :, :3]
-            img = np.flip(img, axis=2)  # RGB to BGR
+                # 复制屏幕内容
+                state['mem_dc'].BitBlt((0, 0), (width, height), state['img_dc'], (left, top), win32con.SRCCOPY)
             
-            # 清理资源
-            mem_dc.DeleteDC()
-            win32gui.DeleteObject(screenshot.GetHandle())
-            win32gui.ReleaseDC(hdesktop, desktop_dc)
+                # 通过GetDIBits把位图数据直接写入预分配的缓冲区
+                buf = state['buf']
+                lines = state['get_dibits'](
+                    state['mem_dc'].GetSafeHdc(), state['bitmap'].GetHandle(),
+                    0, height, buf.ctypes.data, ctypes.byref(state['bmi']), 0  # DIB_RGB_COLORS
+                )
+                if lines != height:
+                    raise OSError(f"GetDIBits只读取了 {lines}/{height} 行")
             
-            return img
+                # DIB数据本身就是BGRA，去掉alpha通道即为BGR；缓冲区会被下一帧覆盖，返回副本
+                return buf[:, :, :3].copy()
             
+            except Exception as e:
+                print(f"Win32截图失败: {e}")
+                self._release_win32()
+                return None
+    
+    def _create_win32_state(self, left: int, top: int, width: int, height: int) -> dict:
+        """创建Win32截图所需的设备上下文、位图和缓冲区"""
+        import win32gui
+        import win32ui
+        
+        # 获取桌面窗口
+        hdesktop = win32gui.GetDesktopWindow()
+        
+        # 创建设备上下文
+        desktop_dc = win32gui.GetWindowDC(hdesktop)
+        img_dc = win32ui.CreateDCFromHandle(desktop_dc)
+        mem_dc = img_dc.CreateCompatibleDC()
+        
+        # 创建位图
+        bitmap = win32ui.CreateBitmap()
+        bitmap.CreateCompatibleBitmap(img_dc, width, height)
+        mem_dc.SelectObject(bitmap)
+        
+        # 32位自顶向下DIB（高度为负），与numpy数组行序一致
+        bmi = _BITMAPINFOHEADER()
+        bmi.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
+        bmi.biWidth = width
+        bmi.biHeight = -height
+        bmi.biPlanes = 1
+        bmi.biBitCount = 32
+        bmi.biCompression = 0  # BI_RGB
+        
+        return {
+            'geometry': (left, top, width, height),
+            'hdesktop': hdesktop,
+            'desktop_dc': desktop_dc,
+            'img_dc': img_dc,
+            'mem_dc': mem_dc,
+            'bitmap': bitmap,
+            'bmi': bmi,
+            'buf': np.empty((height, width, 4), dtype=np.uint8),
+            'get_dibits': _get_dibits(),
+        }
+    
+    def _release_win32(self):
+        """释放缓存的Win32 GDI对象"""
+        state = self._win32_state
+        self._win32_state = None
+        if state is None:
+            return
+        try:
+            import win32gui
+            # img_dc包装的是GetWindowDC返回的句柄，只能用ReleaseDC释放
+            state['mem_dc'].DeleteDC()
+            win32gui.DeleteObject(state['bitmap'].GetHandle())
+            win32gui.ReleaseDC(state['hdesktop'], state['desktop_dc'])
         except Exception as e:
-            print(f"Win32截图失败: {e}")
-            return None
+            print(f"释放Win32截图资源失败: {e}")
+    
+    def close(self):
+        """释放截图资源（mss实例只能在创建它的线程中关闭，这里释放当前线程的实例）"""
+        with self._win32_lock:
+            self._release_win32()
+        sct = getattr(self._mss_local, 'sct', None)
+        if sct is not None:
+            self._mss_local.sct = None
+            sct.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def _capture_region_with_pyautogui(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
         """使用pyautogui截取区域"""
         screenshot = pyautogui.screenshot(region=(x, y, width, height))
-        screenshot_np = np.array(screenshot)
-        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-        return screenshot_bgr
+        return self._to_bgr(screenshot)
     
     def _capture_region_with_pil(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
         """使用PIL截取区域"""
         bbox = (x, y, x + width, y + height)
         screenshot = ImageGrab.grab(bbox)
-        screenshot_np = np.array(screenshot)
-        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-        return screenshot_bgr
+        return self._to_bgr(screenshot)
     
     def save_screenshot(self, image: np.ndarray, filepath: str) -> bool:
         """
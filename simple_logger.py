@@ -6,16 +6,36 @@
 
 import os
 import sys
+import time
+import atexit
+import threading
 from pathlib import Path
-from datetime import datetime
+
+# 日志级别，可通过环境变量 OCR_LOG_LEVEL 设置
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# 缓冲写入时每隔多少条日志刷新一次文件（WARNING及以上立即刷新）
+FLUSH_EVERY = 50
 
 class SimpleLogger:
     """简单的日志管理器"""
     
     def __init__(self):
         self.log_file = None
+        self._fh = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._log_dir = None
+        self._day = None
+        # 时间戳字符串按秒缓存：(秒, 字符串)
+        self._ts_cache = (None, '')
+        self.level = LEVELS.get(os.environ.get('OCR_LOG_LEVEL', 'INFO').upper(), LEVELS['INFO'])
         self.setup_logging()
     
+    def is_enabled_for(self, level):
+        """检查指定级别是否会被输出"""
+        return LEVELS.get(level, LEVELS['INFO']) >= self.level
+    
     def setup_logging(self):
         """设置日志"""
         try:
@@ -31,9 +51,11 @@ class SimpleLogger:
             log_dir = app_dir / "logs"
             log_dir.mkdir(exist_ok=True)
             
-            # 日志文件名（按日期）
-            log_filename = f"monitor_ocr_{datetime.now().strftime('%Y%m%d')}.log"
-            self.log_file = log_dir / log_filename
+            self._log_dir = log_dir
+            
+            # 文件句柄只在日期变化时重新打开，带缓冲写入，退出时关闭
+            self._open_for_day(time.localtime()[:3])
+            atexit.register(self.close)
             
             # 记录启动信息
             self.log("INFO", "日志系统初始化成功")
@@ -42,37 +64,76 @@ class SimpleLogger:
         except Exception as e:
             print(f"日志系统初始化失败: {e}")
     
-    def log(self, level, message):
-        """记录日志"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    def _open_for_day(self, day):
+        """打开指定日期 (年, 月, 日) 的日志文件，调用方需持有锁或处于初始化阶段"""
+        if self._fh:
+            self._fh.close()
+        # 日志文件名（按日期）
+        log_filename = f"monitor_ocr_{day[0]:04d}{day[1]:02d}{day[2]:02d}.log"
+        self.log_file = self._log_dir / log_filename
+        self._fh = open(self.log_file, 'a', encoding='utf-8', buffering=1 << 16)
+        self._pending = 0
+        self._day = day
+    
+    def _timestamp(self):
+        """返回当前时间字符串，同一秒内复用；返回 (日期, 字符串)"""
+        sec = int(time.time())
+        cached_sec, cached = self._ts_cache
+        if sec != cached_sec:
+            tm = time.localtime(sec)
+            cached = (tm[:3], time.strftime('%Y-%m-%d %H:%M:%S', tm))
+            self._ts_cache = (sec, cached)
+        return cached
+    
+    def log(self, level, message, *args):
+        """记录日志，args非空时按 % 格式化（仅在级别启用时才格式化）"""
+        if not self.is_enabled_for(level):
+            return
+        if args:
+            message = message % args
+        day, timestamp = self._timestamp()
         log_line = f"[{timestamp}] [{level}] {message}"
         
         # 输出到控制台
         print(log_line)
         
         # 写入文件
-        if self.log_file:
+        if self._fh:
             try:
-                with open(self.log_file, 'a', encoding='utf-8') as f:
-                    f.write(log_line + '\n')
+                with self._lock:
+                    # 跨天时切换到新日期的日志文件
+                    if day != self._day and self._fh:
+                        self._open_for_day(day)
+                    self._fh.write(log_line + '\n')
+                    self._pending += 1
+                    if self._pending >= FLUSH_EVERY or LEVELS.get(level, LEVELS['INFO']) >= LEVELS['WARNING']:
+                        self._fh.flush()
+                        self._pending = 0
             except Exception as e:
                 print(f"写入日志文件失败: {e}")
     
-    def info(self, message):
+    def close(self):
+        """刷新并关闭日志文件"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+    
+    def info(self, message, *args):
         """信息日志"""
-        self.log("INFO", message)
+        self.log("INFO", message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """错误日志"""
-        self.log("ERROR", message)
+        self.log("ERROR", message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """警告日志"""
-        self.log("WARNING", message)
+        self.log("WARNING", message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """调试日志"""
-        self.log("DEBUG", message)
+        self.log("DEBUG", message, *args)
 
 # 全局日志实例
 _logger = None
@@ -84,14 +145,22 @@ def get_logger():
         _logger = SimpleLogger()
     return _logger
 
-def log_info(message):
+def log_info(message, *args):
     """快捷信息日志"""
-    get_logger().info(message)
+    get_logger().info(message, *args)
 
-def log_error(message):
+def log_error(message, *args):
     """快捷错误日志"""
-    get_logger().error(message)
+    get_logger().error(message, *args)
 
-def log_warning(message):
+def log_warning(message, *args):
     """快捷警告日志"""
-    get_logger().warning(message)
+    get_logger().warning(message, *args)
+
+def log_debug(message, *args):
+    """快捷调试日志"""
+    get_logger().debug(message, *args)
+
+def log_enabled(level):
+    """检查指定级别的日志是否会被输出"""
+    return get_logger().is_enabled_for(level)
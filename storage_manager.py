@@ -1,14 +1,59 @@
 import os
+import time
+import queue
+import atexit
+import threading
 import cv2
 import numpy as np
 from datetime import datetime
 from typing import Optional
 import shutil
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+def _scandir_walk(path: str):
+    """递归遍历目录，逐个产出文件的DirEntry（stat结果由DirEntry缓存）"""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from _scandir_walk(entry.path)
+        else:
+            yield entry
+
+# 支持的截图保存格式及对应的编码参数
+_IMAGE_FORMATS = {
+    'jpg': [cv2.IMWRITE_JPEG_QUALITY, 95],
+    'png': [cv2.IMWRITE_PNG_COMPRESSION, 1],
+    'webp': [cv2.IMWRITE_WEBP_QUALITY, 101],  # 质量>100为无损WebP
+}
 
 class StorageManager:
-    def __init__(self, base_dir: str = "./screenshots"):
+    def __init__(self, base_dir: str = "./screenshots", image_format: str = "jpg", jpeg_quality: int = 95,
+                 async_save: bool = False):
+        if image_format not in _IMAGE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}")
         self.base_dir = base_dir
+        self.image_format = image_format
+        # JPEG质量越低编码越快、文件越小；存档截图只需保证文字可辨认
+        self._encode_params = dict(_IMAGE_FORMATS)
+        self._encode_params['jpg'] = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
         self.ensure_base_directory()
+        
+        # 开启async_save时图片编码和写盘放到后台线程，截图/识别线程只负责入队；
+        # 此时返回的路径在文件写完之前就已可见，调用方需要先flush()再读取文件
+        self.async_save = async_save
+        self._save_q = queue.Queue(maxsize=64)
+        self._saver_thread = None
+        self._saver_lock = threading.Lock()
+        
+        # 日期文件夹每天只变一次，缓存上次的结果避免每次保存都探测/创建目录
+        self._last_date_key = None
+        self._last_folder = None
     
     def ensure_base_directory(self):
         """确保基础目录存在"""
@@ -20,80 +65,137 @@ class StorageManager:
         if date is None:
             date = datetime.now()
         
-        year = str(date.year)
-        month = f"{date.month:02d}"
-        day = f"{date.day:02d}"
+        return self._date_folder((date.year, date.month, date.day))
+    
+    def _date_folder(self, key: tuple) -> str:
+        """按 (年, 月, 日) 获取日期文件夹路径，结果缓存到日期变化为止"""
+        if key == self._last_date_key:
+            return self._last_folder
+        
+        year = str(key[0])
+        month = f"{key[1]:02d}"
+        day = f"{key[2]:02d}"
         
         folder_path = os.path.join(self.base_dir, year, month, day)
         
         # 确保文件夹存在
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
+        os.makedirs(folder_path, exist_ok=True)
         
+        self._last_date_key = key
+        self._last_folder = folder_path
         return folder_path
     
-    def save_screenshot(self, image: np.ndarray, prefix: str = "screenshot") -> str:
-        """保存截图并返回文件路径"""
-        timestamp = datetime.now()
-        folder_path = self.get_date_folder(timestamp)
+    def save_screenshot(self, image: np.ndarray, prefix: str = "screenshot",
+                        image_format: Optional[str] = None) -> str:
+        """保存截图并返回文件路径，image_format为None时使用实例默认格式
+        
+        默认同步写盘，返回时文件已存在；写入失败时记录错误日志。
+        """
+        image_format = image_format or self.image_format
+        if image_format not in _IMAGE_FORMATS:
+            raise ValueError(f"不支持的图片格式: {image_format}")
+        
+        # 同一个时间戳同时用于日期文件夹和文件名，避免构造datetime和strftime
+        ns = time.time_ns()
+        tm = time.localtime(ns // 1_000_000_000)
+        folder_path = self._date_folder((tm.tm_year, tm.tm_mon, tm.tm_mday))
         
         # 生成文件名
-        filename = f"{prefix}_{timestamp.strftime('%H%M%S_%f')[:-3]}.jpg"
+        ms = (ns // 1_000_000) % 1000
+        filename = f"{prefix}_{tm.tm_hour:02d}{tm.tm_min:02d}{tm.tm_sec:02d}_{ms:03d}.{image_format}"
         filepath = os.path.join(folder_path, filename)
         
-        # 保存图片
-        cv2.imwrite(filepath, image)
+        params = self._encode_params[image_format]
+        if not self.async_save:
+            self._write_image(image, filepath, params)
+            return filepath
+        
+        # 交给后台线程保存图片，队列满时阻塞等待
+        self._ensure_saver()
+        self._save_q.put((image, filepath, params))
         
         return filepath
     
+    @staticmethod
+    def _write_image(image: np.ndarray, filepath: str, params: list) -> bool:
+        """编码并写入单张图片，失败时记录错误日志并返回False"""
+        try:
+            if cv2.imwrite(filepath, image, params):
+                return True
+            logger.error(f"保存截图失败: {filepath}")
+        except Exception as e:
+            logger.error(f"保存截图失败: {filepath}: {e}")
+        return False
+    
+    def _ensure_saver(self):
+        """首次保存时启动后台保存线程"""
+        if self._saver_thread is not None:
+            return
+        with self._saver_lock:
+            if self._saver_thread is None:
+                self._saver_thread = threading.Thread(target=self._saver_loop, name="ScreenshotSaver", daemon=True)
+                self._saver_thread.start()
+                # 进程退出前写完队列中剩余的图片
+                atexit.register(self.flush)
+    
+    def _saver_loop(self):
+        """后台保存线程：依次编码并写入队列中的图片"""
+        while True:
+            image, filepath, params = self._save_q.get()
+            try:
+                self._write_image(image, filepath, params)
+            finally:
+                self._save_q.task_done()
+    
+    def flush(self):
+        """等待所有已提交的截图写入磁盘"""
+        self._save_q.join()
+    
     def cleanup_old_files(self, days: int = 30):
         """清理指定天数前的文件"""
         cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
         
-        for root, dirs, files in os.walk(self.base_dir):
-            for file in files:
-                filepath = os.path.join(root, file)
-                if os.path.getmtime(filepath) < cutoff_date:
-                    try:
-                        os.remove(filepath)
-                    except OSError:
-                        pass
+        # 先等后台队列写完，避免清理与尚未落盘的截图交错
+        self.flush()
+        
+        for entry in _scandir_walk(self.base_dir):
+            try:
+                if entry.stat().st_mtime < cutoff_date:
+                    os.remove(entry.path)
+            except OSError:
+                pass
         
         # 清理空文件夹
         self._remove_empty_folders(self.base_dir)
+        # 当天的文件夹可能被当作空文件夹删除，下次保存时重新创建
+        self._last_date_key = None
     
     def _remove_empty_folders(self, path: str):
-        """递归删除空文件夹"""
-        if not os.path.isdir(path):
-            return
-        
-        # 递归处理子文件夹
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
-            if os.path.isdir(item_path):
-                self._remove_empty_folders(item_path)
-        
-        # 如果文件夹为空且不是根目录，则删除
-        if not os.listdir(path) and path != self.base_dir:
+        """自底向上删除空文件夹"""
+        # 后序遍历保证子文件夹先处理；非空目录rmdir会直接失败，无需再listdir判断
+        for root, _dirs, _files in os.walk(path, topdown=False):
+            if root == self.base_dir:
+                continue
             try:
-                os.rmdir(path)
+                os.rmdir(root)
             except OSError:
                 pass
     
+    def _entry_sizes(self):
+        """逐个产出基础目录下文件的大小，跳过无法访问的文件"""
+        for entry in _scandir_walk(self.base_dir):
+            try:
+                yield entry.stat().st_size
+            except OSError:
+                continue
+    
     def get_storage_stats(self) -> dict:
         """获取存储统计信息"""
-        total_files = 0
-        total_size = 0
-        
-        for root, dirs, files in os.walk(self.base_dir):
-            for file in files:
-                filepath = os.path.join(root, file)
-                if os.path.exists(filepath):
-                    total_files += 1
-                    total_size += os.path.getsize(filepath)
+        # 文件大小直接收集到int64数组中，再一次性求和
+        sizes = np.fromiter(self._entry_sizes(), dtype=np.int64)
         
         return {
-            'total_files': total_files,
-            'total_size_mb': round(total_size / (1024 * 1024), 2),
+            'total_files': int(sizes.size),
+            'total_size_mb': round(int(sizes.sum()) / (1024 * 1024), 2),
             'base_directory': self.base_dir
         }
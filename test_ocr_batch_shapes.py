@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+批量识别与逐张识别结果一致性测试（混合尺寸）
+"""
+
+import numpy as np
+import pytest
+
+from ocr_processor import OCRProcessor
+
+
+class ShapeEchoReader:
+    """模拟EasyOCR Reader：识别文本为实际送入识别的图像宽高
+
+    与EasyOCR一样，传入n_height/n_width时先把所有图像缩放到该尺寸，
+    因此批量识别若统一缩放，结果会与逐张识别不同。
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def readtext_batched(self, images, n_width=None, n_height=None, detail=1, **kwargs):
+        self.calls.append([img.shape for img in images])
+        assert len({img.shape for img in images}) == 1 or (n_width and n_height), \
+            "readtext_batched要求输入尺寸一致"
+        results = []
+        for img in images:
+            height, width = img.shape[:2]
+            texts = [f"宽度: {n_width or width}", f"高度: {n_height or height}"]
+            if detail:
+                results.append([([[0, 0], [1, 0], [1, 1], [0, 1]], text, 0.99) for text in texts])
+            else:
+                results.append(texts)
+        return results
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    reader = ShapeEchoReader()
+    monkeypatch.setattr(OCRProcessor, 'preload_reader', classmethod(lambda cls, config: reader))
+    config = {'field_mappings': {'宽度': ['width'], '高度': ['height']}}
+    return OCRProcessor(config), reader
+
+
+def _noise(height, width):
+    rng = np.random.default_rng(height * 10000 + width)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def test_mixed_shapes_match_single_image(processor):
+    ocr, reader = processor
+    images = [_noise(600, 800), _noise(700, 400), _noise(600, 800), _noise(900, 1200)]
+
+    batched = ocr.process_images(images)
+    # 每种尺寸只调用一次readtext_batched
+    assert len(reader.calls) == 3
+
+    singles = []
+    for image in images:
+        ocr._last_frame = None
+        singles.append(ocr.process_image(image))
+
+    assert batched == singles
+    assert [r['width'] for r in batched] == ['800', '400', '800', '1200']
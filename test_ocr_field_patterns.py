@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+字段匹配模式优先级回归测试
+"""
+
+import pytest
+
+from ocr_processor import OCRProcessor, _TextIndex, _split_field_suffix
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr(OCRProcessor, 'preload_reader', classmethod(lambda cls, config: object()))
+    return OCRProcessor({'field_mappings': {'最高速度 (rpm)': ['max_speed']}})
+
+
+def test_exact_field_name_preferred_over_bracket_variant(processor):
+    # 中文括号写法出现在前、与字段名完全一致的写法在后：整段文本中精确匹配优先
+    field_name = '最高速度 (rpm)'
+    index = _TextIndex.build(['最高速度 （rpm）: 100', '最高速度 (rpm): 200'])
+    patterns = processor._compile_field_patterns(field_name)
+    assert processor._extract_with_patterns(index, field_name, patterns) == '200'
+
+
+def test_field_without_brackets_has_no_duplicate_pattern(processor):
+    assert len(processor._generate_field_patterns('温度')) == 1
+
+
+@pytest.mark.parametrize('field_name, expected', [
+    ('压力 (min)', ('压力', 'min')),
+    ('压力（min）', ('压力', 'min')),
+    ('最高速度 (rpm)', ('最高速度', 'rpm')),
+    # 英文括号前没有空格、大小写不同的写法按完整字段名匹配，不拆分
+    ('压力(min)', ('压力(min)', '')),
+    ('速度 (RPM)', ('速度 (RPM)', '')),
+])
+def test_split_field_suffix(field_name, expected):
+    assert _split_field_suffix(field_name) == expected
@@ -20,10 +20,15 @@ def create_mock_packaged_env():
     # 检查是否有现有的模型文件可以复制
     existing_models = Path.home() / ".EasyOCR" / "model"
     if existing_models.exists():
-        # 复制现有模型文件到测试目录
+        # 复制现有模型文件到测试目录（测试只读取模型，优先使用硬链接避免复制大文件）
         for model_file in existing_models.glob("*.pth"):
             if "craft" in model_file.name or "sim" in model_file.name:
-                shutil.copy2(model_file, models_dir / model_file.name)
+                target = models_dir / model_file.name
+                try:
+                    os.link(model_file, target)
+                except OSError:
+                    # 跨文件系统等无法硬链接时回退为复制
+                    shutil.copy2(model_file, target)
                 print(f"复制模型文件: {model_file.name}")
     else:
         # 创建空的模型文件作为占位符
@@ -108,7 +113,7 @@ def test_packaged_environment():
         try:
             shutil.rmtree(mock_meipass)
             print(f"\n清理临时目录: {mock_meipass}")
-        except:
+        except OSError:
             pass
 
 def main():
@@ -5,9 +5,24 @@
 """
 
 import os
+import re
 import sys
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# 用户目录下EasyOCR默认的模型目录，模块加载时解析一次
+HOME_MODEL_DIR = Path.home() / ".EasyOCR" / "model"
+
+def _list_pth(dirpath):
+    """单次scandir列出目录中的.pth文件，返回 [(文件名, 路径, 字节数)]"""
+    with os.scandir(dirpath) as it:
+        return [
+            (entry.name, entry.path, entry.stat().st_size)
+            for entry in it
+            if entry.name.endswith('.pth') and entry.is_file()
+        ]
+
 def test_packaged_environment():
     """模拟测试打包环境"""
     print("=" * 60)
@@ -32,13 +47,24 @@ def test_packaged_environment():
         sys._MEIPASS = str(test_meipass)
         
         # 复制现有模型（如果存在）
-        home_models = Path.home() / ".EasyOCR" / "model"
-        if home_models.exists():
-            import shutil
-            for model_file in home_models.glob("*.pth"):
-                if "craft" in model_file.name or "sim" in model_file.name:
-                    shutil.copy2(model_file, models_dir / model_file.name)
-                    print(f"复制模型: {model_file.name}")
+        home_models = HOME_MODEL_DIR
+        if os.path.isdir(home_models):
+            def copy_model(item):
+                name, path, _ = item
+                # 测试只读取模型，优先硬链接避免复制数百MB的文件
+                target = models_dir / name
+                try:
+                    os.link(path, target)
+                except OSError:
+                    # 跨文件系统等无法硬链接时回退为复制
+                    shutil.copy2(path, target)
+                return name
+            
+            candidates = [m for m in _list_pth(home_models) if "craft" in m[0] or "sim" in m[0]]
+            # 各模型文件相互独立，需要复制时并行进行
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                for name in executor.map(copy_model, candidates):
+                    print(f"复制模型: {name}")
         else:
             # 创建假模型文件
             (models_dir / "craft_mlt_25k.pth").write_bytes(b"fake_detection_model")
@@ -74,9 +100,8 @@ def test_packaged_environment():
         
         # 清理测试目录
         try:
-            import shutil
             shutil.rmtree(test_meipass)
-        except:
+        except OSError:
             pass
 
 def test_model_files():
@@ -92,13 +117,12 @@ def test_model_files():
     
     # 检查本地是否有模型（仅供参考，不影响构建）
     local_model_dir = Path("easyocr_models")
-    if local_model_dir.exists():
-        models = list(local_model_dir.glob("*.pth"))
+    if os.path.isdir(local_model_dir):
+        models = _list_pth(local_model_dir)
         if models:
             print(f"\n参考: 本地发现 {len(models)} 个模型文件（不会打包）:")
-            for model in models[:3]:  # 只显示前3个
-                size_mb = model.stat().st_size / (1024 * 1024)
-                print(f"   - {model.name}: {size_mb:.1f} MB")
+            # 只显示前3个，合并为一次输出
+            print("\n".join(f"   - {name}: {size / (1024 * 1024):.1f} MB" for name, _, size in models[:3]))
         else:
             print("\n参考: 本地无模型文件（正常）")
     else:
@@ -114,7 +138,7 @@ def test_spec_file():
     print("=" * 40)
     
     spec_file = Path("MonitorOCR_EasyOCR.spec")
-    if not spec_file.exists():
+    if not os.path.isfile(spec_file):
         print("❌ spec文件不存在")
         return False
     
@@ -128,9 +152,13 @@ def test_spec_file():
         ("EasyOCR模型文件说明", "模型下载说明文档"),
     ]
     
+    # 一次扫描找出所有检查项；零宽前瞻在每个位置都尝试匹配，相互重叠的检查项也不会漏掉
+    pattern = re.compile('(?=(' + '|'.join(re.escape(check) for check, _ in checks) + '))')
+    found = set(pattern.findall(spec_content))
+    
     all_good = True
     for check, desc in checks:
-        if check in spec_content:
+        if check in found:
             print(f"✅ {desc}")
         else:
             print(f"❌ {desc} - 未找到: {check}")
@@ -166,7 +194,8 @@ def main():
     print(f"配置文件检查: {'✅' if spec_ok else '❌'}")
     print(f"打包环境测试: {'✅' if package_ok else '❌'}")
     
-    if all([models_ok, spec_ok, package_ok]):
+    all_ok = bool(models_ok and spec_ok and package_ok)
+    if all_ok:
         print("\n🎉 所有测试通过！可以进行打包")
         if is_github_actions:
             print("\n✅ GitHub Actions环境就绪")
@@ -187,7 +216,7 @@ def main():
         if is_github_actions:
             sys.exit(1)
     
-    return all([models_ok, spec_ok, package_ok])
+    return all_ok
 
 if __name__ == "__main__":
     main()